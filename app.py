@@ -1,12 +1,170 @@
+import csv
 import datetime
-from typing import List, Dict
-from flask import Flask, render_template, request, redirect, url_for, flash, session
+import functools
+import hashlib
+import hmac
+import itertools
+import json
+import math
+import os
+import random
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import List, Dict, NamedTuple, Optional, Tuple
+import click
+from flask import Flask, Response, abort, make_response, render_template, request, redirect, url_for, flash, session, jsonify, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+from markupsafe import Markup
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import OperationalError
+
+from bankcore import DEPOSIT_TYPE, INTEREST_TYPE, TRANSFER_TYPE, WITHDRAWAL_TYPE, month_bounds, monthly_interest
+from cache import VersionedCache
+from group_commit import GroupCommitWriter, WriterClosed
+from metrics import Metrics
+from pubsub import EventHub
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = '6a5955391897583ef1563b15bbe86fdf42a9b94d2d384e1c'
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///banque.db'
-db = SQLAlchemy(app)
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('BANQUE_DATABASE_URI', 'sqlite:///banque.db')
+app.config['GROUP_COMMIT'] = os.environ.get('BANQUE_GROUP_COMMIT') == '1'
+app.config['GROUP_COMMIT_MAX_BATCH'] = int(os.environ.get('BANQUE_GROUP_COMMIT_MAX_BATCH', 256))
+app.config['GROUP_COMMIT_MAX_DELAY'] = float(os.environ.get('BANQUE_GROUP_COMMIT_MAX_DELAY', 0.002))
+app.config['ACCOUNT_CACHE_SIZE'] = int(os.environ.get('BANQUE_ACCOUNT_CACHE_SIZE', 10_000))
+app.config['ACCOUNT_CACHE_TTL'] = float(os.environ.get('BANQUE_ACCOUNT_CACHE_TTL', 30))
+# Plusieurs workers : une vue en cache depuis plus de N secondes est confirmée en base avant
+# d'être servie (0 : à chaque lecture). Non défini : un seul processus écrit, aucune vérification.
+revalidate = os.environ.get('BANQUE_ACCOUNT_CACHE_REVALIDATE')
+app.config['ACCOUNT_CACHE_REVALIDATE'] = float(revalidate) if revalidate else None
+app.config['HISTORY_CACHE_SIZE'] = int(os.environ.get('BANQUE_HISTORY_CACHE_SIZE', 1000))
+# Jeton attendu par l'API d'opérations par lots (en-tête « Authorization: Bearer ... ») ;
+# sans jeton configuré, l'API est désactivée
+app.config['API_TOKEN'] = os.environ.get('BANQUE_API_TOKEN')
+# Flux /account/stream : intervalle des battements de cœur (s) et taille de la file par abonné
+app.config['STREAM_HEARTBEAT'] = float(os.environ.get('BANQUE_STREAM_HEARTBEAT', 15))
+app.config['STREAM_QUEUE_SIZE'] = int(os.environ.get('BANQUE_STREAM_QUEUE_SIZE', 100))
+# Moteur de lecture pour les routes GET qui ne font que lire : une autre base SQLite (copie)
+# avec BANQUE_READ_DATABASE_URI, ou, avec BANQUE_READ_ENGINE=1, un second pool sur la même
+# base ; ses connexions sont en lecture seule (PRAGMA query_only)
+app.config['READ_DATABASE_URI'] = os.environ.get('BANQUE_READ_DATABASE_URI')
+app.config['READ_ENGINE'] = os.environ.get('BANQUE_READ_ENGINE') == '1' or bool(app.config['READ_DATABASE_URI'])
+engine_options = {}
+for option, variable in (('pool_size', 'BANQUE_POOL_SIZE'), ('max_overflow', 'BANQUE_POOL_MAX_OVERFLOW'),
+                         ('pool_timeout', 'BANQUE_POOL_TIMEOUT')):
+    if os.environ.get(variable):
+        engine_options[option] = float(os.environ[variable]) if option == 'pool_timeout' else int(os.environ[variable])
+if app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+    # Délai d'attente d'un verrou SQLite avant l'erreur « database is locked » (busy_timeout)
+    engine_options['connect_args'] = {'timeout': float(os.environ.get('BANQUE_SQLITE_BUSY_TIMEOUT', 15))}
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options
+# PRAGMA appliqués à chaque nouvelle connexion SQLite ; une valeur vide garde le réglage de SQLite.
+# En WAL, les lectures ne bloquent pas l'écrivain et ne sont pas bloquées par lui.
+app.config['SQLITE_PRAGMAS'] = {
+    'journal_mode': os.environ.get('BANQUE_SQLITE_JOURNAL_MODE', 'WAL'),
+    'synchronous': os.environ.get('BANQUE_SQLITE_SYNCHRONOUS', ''),
+    'cache_size': os.environ.get('BANQUE_SQLITE_CACHE_SIZE', ''),
+    'mmap_size': os.environ.get('BANQUE_SQLITE_MMAP_SIZE', ''),
+}
+
+class RoutingSession(Session):
+    # Les routes marquées @read_only lisent sur le moteur de lecture ; un flush écrit toujours
+    # sur le moteur principal
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if read_engine is not None and bind is None and self.info.get('read_only') and not self._flushing:
+            return read_engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+db = SQLAlchemy(app, session_options={'class_': RoutingSession})
+
+def configure_sqlite_engine(engine, read_only: bool = False):
+    pragmas = [(name, value) for name, value in app.config['SQLITE_PRAGMAS'].items() if value]
+    for name, value in pragmas:
+        if not re.fullmatch(r'-?\w+', value):
+            raise ValueError(f"Valeur invalide pour PRAGMA {name} : {value!r}")
+    if read_only:
+        pragmas.append(('query_only', 'ON'))
+
+    @event.listens_for(engine, 'connect')
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas:
+            cursor.execute(f'PRAGMA {name} = {value}')
+        cursor.close()
+
+def read_only(view):
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        db.session.info['read_only'] = True
+        return view(*args, **kwargs)
+    return wrapper
+
+def require_sqlite(engine, variable: str):
+    # Upserts (ON CONFLICT), index FTS5 et sqlite_master : les écritures et init_db sont propres à SQLite
+    if engine.dialect.name != 'sqlite':
+        raise RuntimeError(f"{variable} : seul SQLite est pris en charge, pas {engine.dialect.name}.")
+
+read_engine = None
+with app.app_context():
+    require_sqlite(db.engine, 'BANQUE_DATABASE_URI')
+    configure_sqlite_engine(db.engine)
+    if app.config['READ_ENGINE']:
+        read_engine = create_engine(app.config['READ_DATABASE_URI'] or db.engine.url, **engine_options)
+        require_sqlite(read_engine, 'BANQUE_READ_DATABASE_URI')
+        configure_sqlite_engine(read_engine, read_only=True)
+
+# Seuil (en ms) au-delà duquel une requête est journalisée avec son SQL ; désactivé par défaut
+slow_request_ms = os.environ.get('BANQUE_SLOW_REQUEST_MS')
+metrics = Metrics(app, slow_request_threshold=float(slow_request_ms) / 1000 if slow_request_ms else None)
+with app.app_context():
+    metrics.instrument_engine(db.engine)
+if read_engine is not None:
+    metrics.instrument_engine(read_engine)
+
+# Vues des comptes en lecture seule, invalidées après chaque écriture validée sur le compte.
+# Les écritures des autres processus sont détectées à la lecture (account_view_is_current),
+# si BANQUE_ACCOUNT_CACHE_REVALIDATE est défini.
+account_cache = VersionedCache(app.config['ACCOUNT_CACHE_SIZE'], app.config['ACCOUNT_CACHE_TTL'],
+                               app.config['ACCOUNT_CACHE_REVALIDATE'])
+# Fragments HTML des pages d'historique : la clé contient la dernière transaction du compte,
+# une nouvelle opération rend donc les anciens fragments inaccessibles.
+history_cache = VersionedCache(app.config['HISTORY_CACHE_SIZE'], app.config['ACCOUNT_CACHE_TTL'])
+for cache_name, cache, label in (('account', account_cache, "comptes"), ('history', history_cache, "historique")):
+    for counter, help_text in (
+        ('hits', "lectures servies par le cache."),
+        ('misses', "lectures calculées faute d'entrée en cache."),
+        ('evictions', "entrées retirées du cache faute de place."),
+        ('invalidations', "entrées retirées du cache après une écriture."),
+    ):
+        metrics.register_counter(f'banque_{cache_name}_cache_{counter}_total', f"Cache {label} : {help_text}",
+                                 lambda cache=cache, counter=counter: getattr(cache, counter))
+
+# Nouvelles transactions poussées aux abonnés de /account/stream, une fois validées
+event_hub = EventHub(app.config['STREAM_QUEUE_SIZE'])
+metrics.register_counter('banque_stream_events_total', "Événements remis aux files des abonnés du flux.",
+                         lambda: event_hub.published)
+metrics.register_counter('banque_stream_overflows_total', "Files d'abonnés du flux vidées faute de place.",
+                         lambda: event_hub.overflows)
+
+HISTORY_PAGE_SIZE = 50
+POSTING_RETRIES = 5
+POSTING_RETRY_DELAY = 0.05
+POSTING_BATCH_MAX = 10_000
+INTEREST_CHUNK_SIZE = 10_000
+EXPORT_BATCH_SIZE = 1000
+EXPORT_COLUMNS = ['id', 'date', 'transaction_type', 'amount', 'is_incoming', 'description']
+IMPORT_CHUNK_SIZE = 5000
+PROJECTION_BATCH_SIZE = 100_000
+# Chaque scénario alloue deux tableaux de flottants de la taille du portefeuille
+PROJECTION_MAX_SCENARIOS = 10
+SUMMARY_MAX_MONTHS = 120
+SEARCH_PAGE_SIZE = 50
+SEARCH_PAGE_MAX = 200
+STREAM_RESYNC_LIMIT = 500
+LAST_MONTH = datetime.date.max.replace(day=1)
+RECONCILE_TOLERANCE = 0.005
 
 class Transaction(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -17,11 +175,280 @@ class Transaction(db.Model):
     date = db.Column(db.DateTime, default=datetime.datetime.utcnow)
     account_id = db.Column(db.Integer, db.ForeignKey('account.id'), nullable=False)
 
+    # Index composite utilisé par la pagination par curseur de l'historique ;
+    # (account_id, id) borne la lecture des transactions postérieures à un point de contrôle ;
+    # (date, id) et amount servent la recherche tous comptes confondus
+    __table_args__ = (
+        db.Index('ix_transaction_account_date_id', 'account_id', 'date', 'id'),
+        db.Index('ix_transaction_account_id', 'account_id', 'id'),
+        db.Index('ix_transaction_date_id', 'date', 'id'),
+        db.Index('ix_transaction_amount', 'amount'),
+    )
+
+    @property
+    def signed_amount(self) -> float:
+        outgoing = self.transaction_type == WITHDRAWAL_TYPE or (self.transaction_type == TRANSFER_TYPE and not self.is_incoming)
+        return -self.amount if outgoing else self.amount
+
+    def to_dict(self) -> Dict:
+        return {
+            'id': self.id,
+            'date': self.date.isoformat(),
+            'transaction_type': self.transaction_type,
+            'amount': self.amount,
+            'is_incoming': self.is_incoming,
+            'description': self.description or '',
+        }
+
     def __str__(self):
         direction = "reçu" if self.is_incoming else "envoyé"
         desc = f" - {self.description}" if self.description else ""
         return f"{self.date.strftime('%Y-%m-%d %H:%M:%S')} - {self.transaction_type} {direction}: {self.amount:.2f}€{desc}"
 
+def signed_amount():
+    # Équivalent SQL de Transaction.signed_amount : retraits et transferts sortants en négatif
+    outgoing = db.or_(
+        Transaction.transaction_type == WITHDRAWAL_TYPE,
+        db.and_(Transaction.transaction_type == TRANSFER_TYPE, Transaction.is_incoming == db.false()),
+    )
+    return db.case((outgoing, -Transaction.amount), else_=Transaction.amount)
+
+class BalanceCheckpoint(db.Model):
+    # Solde d'un compte à un instant donné : il inclut toutes les transactions du compte
+    # dont l'id est <= last_transaction_id. Relevé à l'ouverture du compte et à chaque
+    # passage des intérêts mensuels.
+    id = db.Column(db.Integer, primary_key=True)
+    account_id = db.Column(db.Integer, db.ForeignKey('account.id'), nullable=False)
+    taken_at = db.Column(db.DateTime, nullable=False, default=datetime.datetime.utcnow)
+    balance = db.Column(db.Float, nullable=False)
+    last_transaction_id = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (db.Index('ix_balance_checkpoint_account_taken_at', 'account_id', 'taken_at'),)
+
+class MonthlySummary(db.Model):
+    # Nombre et somme des transactions par compte, mois (UTC, premier jour), type et sens.
+    # Tenu à jour dans la même transaction SQL que chaque écriture ; la commande
+    # rebuild-monthly-summaries le recalcule à partir de la table des transactions.
+    account_id = db.Column(db.Integer, db.ForeignKey('account.id'), primary_key=True)
+    month = db.Column(db.Date, primary_key=True)
+    transaction_type = db.Column(db.String(20), primary_key=True)
+    is_incoming = db.Column(db.Boolean, primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    total = db.Column(db.Float, nullable=False, default=0.0)
+
+SUMMARY_COLUMNS = ['account_id', 'month', 'transaction_type', 'is_incoming', 'count', 'total']
+
+# Index plein texte FTS5 des descriptions, à contenu externe : il ne stocke que les termes et
+# renvoie aux lignes de « transaction » par leur id. Les déclencheurs le tiennent à jour dans
+# la même transaction que l'écriture ; les descriptions vides (intérêts, dépôts) sont ignorées.
+transaction_search = db.table('transaction_fts', db.column('rowid'), db.column('transaction_fts'))
+SEARCH_INDEX_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS transaction_fts USING fts5(
+        description, content='transaction', content_rowid='id', tokenize='unicode61 remove_diacritics 2')""",
+    """CREATE TRIGGER IF NOT EXISTS transaction_fts_insert AFTER INSERT ON "transaction"
+    WHEN coalesce(new.description, '') != '' BEGIN
+        INSERT INTO transaction_fts (rowid, description) VALUES (new.id, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS transaction_fts_delete AFTER DELETE ON "transaction"
+    WHEN coalesce(old.description, '') != '' BEGIN
+        INSERT INTO transaction_fts (transaction_fts, rowid, description) VALUES ('delete', old.id, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS transaction_fts_update AFTER UPDATE OF description ON "transaction" BEGIN
+        INSERT INTO transaction_fts (transaction_fts, rowid, description)
+            SELECT 'delete', old.id, old.description WHERE coalesce(old.description, '') != '';
+        INSERT INTO transaction_fts (rowid, description)
+            SELECT new.id, new.description WHERE coalesce(new.description, '') != '';
+    END""",
+]
+
+class Statement(NamedTuple):
+    month: datetime.date
+    opening_balance: float
+    closing_balance: float
+    transactions: List[Transaction]
+
+class TransactionPage(NamedTuple):
+    transactions: List[Transaction]
+    next_cursor: Optional[str]
+    prev_cursor: Optional[str]
+
+def encode_cursor(transaction: Transaction) -> str:
+    return f"{transaction.date.isoformat()}_{transaction.id}"
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime.datetime, int]]:
+    if not cursor:
+        return None
+    date, _, transaction_id = cursor.rpartition('_')
+    try:
+        return datetime.datetime.fromisoformat(date), int(transaction_id)
+    except ValueError:
+        return None
+
+def filter_transaction_dates(query, start: Optional[datetime.date] = None, end: Optional[datetime.date] = None):
+    # Bornes incluses : du début de `start` à la fin de `end` ; date.max ne borne rien
+    # (et son lendemain n'est pas représentable)
+    if start:
+        query = query.filter(Transaction.date >= datetime.datetime.combine(start, datetime.time.min))
+    if end and end < datetime.date.max:
+        end_exclusive = datetime.datetime.combine(end + datetime.timedelta(days=1), datetime.time.min)
+        query = query.filter(Transaction.date < end_exclusive)
+    return query
+
+def touch_accounts(*account_ids: int):
+    # Les comptes modifiés sont invalidés dans le cache une fois la transaction validée
+    db.session.info.setdefault('touched_accounts', set()).update(account_ids)
+
+def touch_all_accounts():
+    db.session.info['touched_all_accounts'] = True
+
+@event.listens_for(db.session, 'after_commit')
+def invalidate_touched_accounts(session):
+    if session.info.pop('touched_all_accounts', False):
+        account_cache.bump_all()
+        event_hub.mark_all_stale()
+    touched = session.info.pop('touched_accounts', None)
+    if touched:
+        account_cache.bump(*touched)
+
+@event.listens_for(db.session, 'after_flush')
+def collect_new_transactions(session, flush_context):
+    # Seuls les comptes qui ont un abonné au flux sont concernés
+    for instance in session.new:
+        if isinstance(instance, Transaction) and event_hub.has_subscribers(instance.account_id):
+            session.info.setdefault('new_transactions', []).append((instance.account_id, instance.to_dict()))
+
+@event.listens_for(db.session, 'after_commit')
+def publish_new_transactions(session):
+    # Après invalidate_touched_accounts : un abonné qui relit le compte voit le nouveau solde
+    for account_id, transaction in session.info.pop('new_transactions', ()):
+        event_hub.publish(account_id, transaction)
+
+@event.listens_for(db.session, 'after_rollback')
+def forget_touched_accounts(session):
+    session.info.pop('touched_all_accounts', None)
+    session.info.pop('touched_accounts', None)
+    session.info.pop('new_transactions', None)
+
+def upsert_monthly_summaries(statement):
+    # INSERT ... ON CONFLICT DO UPDATE (SQLite) : les agrégats existants sont incrémentés
+    return statement.on_conflict_do_update(
+        index_elements=SUMMARY_COLUMNS[:4],
+        set_={
+            'count': MonthlySummary.count + statement.excluded['count'],
+            'total': MonthlySummary.total + statement.excluded['total'],
+        },
+    )
+
+@event.listens_for(db.session, 'after_flush')
+def summarize_new_transactions(session, flush_context):
+    # Les transactions insérées par l'ORM alimentent les agrégats mensuels avant le commit ;
+    # les insertions ensemblistes (intérêts en masse) mettent à jour les agrégats elles-mêmes.
+    totals: Dict[Tuple, List] = {}
+    for instance in session.new:
+        if isinstance(instance, Transaction):
+            key = (instance.account_id, instance.date.date().replace(day=1), instance.transaction_type,
+                   instance.is_incoming is not False)
+            entry = totals.setdefault(key, [0, 0.0])
+            entry[0] += 1
+            entry[1] += instance.amount
+    if totals:
+        session.connection().execute(
+            upsert_monthly_summaries(sqlite_insert(MonthlySummary)),
+            [dict(zip(SUMMARY_COLUMNS, key + tuple(entry))) for key, entry in totals.items()],
+        )
+
+def debit(account_id: int, amount: float) -> bool:
+    # Débit conditionnel : le contrôle du solde et l'écriture se font dans la même instruction
+    touch_accounts(account_id)
+    result = db.session.execute(
+        db.update(Account)
+        .where(Account.id == account_id, Account.balance >= amount)
+        .values(balance=Account.balance - amount),
+        execution_options={'synchronize_session': False},
+    )
+    return result.rowcount == 1
+
+def credit(account_id: int, amount: float):
+    touch_accounts(account_id)
+    db.session.execute(
+        db.update(Account).where(Account.id == account_id).values(balance=Account.balance + amount),
+        execution_options={'synchronize_session': False},
+    )
+
+def is_database_locked(error: OperationalError) -> bool:
+    message = str(error.orig).lower()
+    return 'locked' in message or 'busy' in message
+
+def retry_on_lock(work):
+    # Rejoue `work` si SQLite reste verrouillé au-delà du busy timeout
+    # (attente exponentielle avec un peu d'aléa pour désynchroniser les workers).
+    for attempt in range(POSTING_RETRIES):
+        try:
+            return work()
+        except OperationalError as exc:
+            db.session.rollback()
+            if not is_database_locked(exc) or attempt == POSTING_RETRIES - 1:
+                raise
+            time.sleep(POSTING_RETRY_DELAY * 2 ** attempt * random.uniform(0.5, 1.5))
+
+def commit_posting(apply) -> bool:
+    def work() -> bool:
+        if not apply():
+            db.session.rollback()
+            return False
+        db.session.commit()
+        return True
+    return retry_on_lock(work)
+
+class Posting(NamedTuple):
+    kind: str  # 'deposit', 'withdraw' ou 'transfer'
+    account_id: int
+    amount: float
+    description: str = ""
+    to_account_id: Optional[int] = None
+
+def iter_transaction_rows(account_id: int, start: Optional[datetime.date] = None, end: Optional[datetime.date] = None):
+    # Lecture en flux : yield_per récupère les lignes par lots au lieu de tout matérialiser
+    query = db.select(*(getattr(Transaction, column) for column in EXPORT_COLUMNS)).where(Transaction.account_id == account_id)
+    query = filter_transaction_dates(query, start, end).order_by(Transaction.date, Transaction.id)
+    yield from db.session.execute(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+
+def export_record(row) -> Dict:
+    record = row._asdict()
+    record['date'] = row.date.isoformat()
+    record['description'] = row.description or ''
+    return record
+
+class _CsvLine:
+    # Pseudo-fichier pour csv.writer : writerow() renvoie directement la ligne formatée
+    def write(self, line: str) -> str:
+        return line
+
+def export_csv(rows):
+    writer = csv.writer(_CsvLine())
+    chunk = [writer.writerow(EXPORT_COLUMNS)]
+    for row in rows:
+        record = export_record(row)
+        chunk.append(writer.writerow([record[column] for column in EXPORT_COLUMNS]))
+        if len(chunk) >= EXPORT_BATCH_SIZE:
+            yield ''.join(chunk)
+            chunk = []
+    yield ''.join(chunk)
+
+def export_jsonl(rows):
+    chunk = []
+    for row in rows:
+        chunk.append(json.dumps(export_record(row), ensure_ascii=False) + '\n')
+        if len(chunk) >= EXPORT_BATCH_SIZE:
+            yield ''.join(chunk)
+            chunk = []
+    yield ''.join(chunk)
+
+EXPORT_FORMATS = {
+    'csv': (export_csv, 'text/csv'),
+    'jsonl': (export_jsonl, 'application/x-ndjson'),
+}
+
 class Account(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), unique=True, nullable=False)
@@ -32,19 +459,80 @@ class Account(db.Model):
     transactions = db.relationship('Transaction', backref='account', lazy=True)
 
     def deposit(self, amount: float, description: str = ""):
-        self.balance += amount
-        new_transaction = Transaction(amount=amount, transaction_type="Dépôt", description=description, account=self)
-        db.session.add(new_transaction)
-        db.session.commit()
+        self._post(Posting('deposit', self.id, amount, description), lambda: self._apply_deposit(amount, description))
 
     def withdraw(self, amount: float, description: str = "") -> bool:
-        if self.balance >= amount:
-            self.balance -= amount
-            new_transaction = Transaction(amount=amount, transaction_type="Retrait", description=description, account=self)
-            db.session.add(new_transaction)
+        return self._post(Posting('withdraw', self.id, amount, description),
+                          lambda: self._apply_withdraw(amount, description))
+
+    def transfer(self, to_account: 'Account', amount: float) -> bool:
+        result = self._post(Posting('transfer', self.id, amount, to_account_id=to_account.id),
+                            lambda: self._apply_transfer(to_account, amount))
+        db.session.expire(to_account, ['balance'])
+        return result
+
+    # Les méthodes _apply_* modifient la session sans la valider : elles servent aussi
+    # au thread d'écriture groupée, qui valide plusieurs opérations d'un coup.
+    # Les soldes sont modifiés par des UPDATE relatifs en SQL, jamais par relecture/écriture
+    # en Python : deux workers concurrents ne peuvent pas perdre une mise à jour.
+    def _apply_deposit(self, amount: float, description: str = "") -> bool:
+        credit(self.id, amount)
+        db.session.expire(self, ['balance'])
+        new_transaction = Transaction(amount=amount, transaction_type=DEPOSIT_TYPE, description=description, account_id=self.id)
+        db.session.add(new_transaction)
+        return True
+
+    def _apply_withdraw(self, amount: float, description: str = "") -> bool:
+        if not debit(self.id, amount):
+            return False
+        db.session.expire(self, ['balance'])
+        new_transaction = Transaction(amount=amount, transaction_type=WITHDRAWAL_TYPE, description=description, account_id=self.id)
+        db.session.add(new_transaction)
+        return True
+
+    def _apply_transfer(self, to_account: 'Account', amount: float) -> bool:
+        if not debit(self.id, amount):
+            return False
+        credit(to_account.id, amount)
+        db.session.expire(self, ['balance'])
+        db.session.expire(to_account, ['balance'])
+
+        # Transaction sortante pour le compte émetteur
+        outgoing_transaction = Transaction(
+            amount=amount,
+            transaction_type=TRANSFER_TYPE,
+            description=f"vers {to_account.name}",
+            is_incoming=False,
+            account_id=self.id
+        )
+        # Transaction entrante pour le compte destinataire
+        incoming_transaction = Transaction(
+            amount=amount,
+            transaction_type=TRANSFER_TYPE,
+            description=f"de {self.name}",
+            is_incoming=True,
+            account_id=to_account.id
+        )
+        db.session.add(outgoing_transaction)
+        db.session.add(incoming_transaction)
+        return True
+
+    def _post(self, posting: 'Posting', apply) -> bool:
+        # Écriture groupée si elle est active, sinon (ou si elle vient d'être arrêtée) commit direct
+        writer = posting_writer
+        if writer is not None:
+            # Comme en mode commit par appel, on clôt la transaction de la requête :
+            # elle ne garde pas de connexion du pool pendant l'attente du thread écrivain.
             db.session.commit()
-            return True
-        return False
+            try:
+                result = writer.submit(posting)
+            except WriterClosed:
+                pass
+            else:
+                # Le solde a été modifié par la session du thread écrivain
+                db.session.expire(self)
+                return result
+        return commit_posting(apply)
 
     def get_balance(self) -> float:
         return self.balance
@@ -52,19 +540,165 @@ class Account(db.Model):
     def get_transactions(self) -> List[Transaction]:
         return self.transactions
 
+    def get_transactions_page(self, next_cursor: Optional[str] = None, prev_cursor: Optional[str] = None,
+                              start: Optional[datetime.date] = None, end: Optional[datetime.date] = None,
+                              limit: int = HISTORY_PAGE_SIZE) -> TransactionPage:
+        # Pagination par curseur sur (account_id, date, id), du plus récent au plus ancien.
+        # `next_cursor` donne les transactions plus anciennes, `prev_cursor` les plus récentes.
+        query = filter_transaction_dates(Transaction.query.filter(Transaction.account_id == self.id), start, end)
+        position = decode_cursor(prev_cursor)
+        backwards = position is not None
+        if backwards:
+            query = query.filter(db.tuple_(Transaction.date, Transaction.id) > position)
+            query = query.order_by(Transaction.date.asc(), Transaction.id.asc())
+        else:
+            position = decode_cursor(next_cursor)
+            if position:
+                query = query.filter(db.tuple_(Transaction.date, Transaction.id) < position)
+            query = query.order_by(Transaction.date.desc(), Transaction.id.desc())
+
+        transactions = query.limit(limit + 1).all()
+        has_more = len(transactions) > limit
+        if backwards and not has_more:
+            # Retour en tête d'historique : on repart d'une première page complète
+            return self.get_transactions_page(start=start, end=end, limit=limit)
+        transactions = transactions[:limit]
+        if backwards:
+            transactions.reverse()
+        if not transactions:
+            return TransactionPage(transactions, None, None)
+
+        has_older = has_more if not backwards else True
+        has_newer = has_more if backwards else position is not None
+        return TransactionPage(
+            transactions,
+            encode_cursor(transactions[-1]) if has_older else None,
+            encode_cursor(transactions[0]) if has_newer else None,
+        )
+
+    def balance_before(self, moment: datetime.datetime) -> float:
+        # Solde compte tenu des transactions antérieures à `moment`. On part du dernier point
+        # de contrôle précédent et on n'applique que les transactions qui le suivent ; sans
+        # point de contrôle, on remonte depuis le solde courant.
+        checkpoint = (BalanceCheckpoint.query
+                      .filter(BalanceCheckpoint.account_id == self.id, BalanceCheckpoint.taken_at < moment)
+                      .order_by(BalanceCheckpoint.taken_at.desc(), BalanceCheckpoint.id.desc())
+                      .first())
+        if checkpoint:
+            # likely() indique à SQLite que le filtre de date écarte peu de lignes :
+            # il parcourt alors l'index (account_id, id) à partir du point de contrôle
+            tail = db.session.query(db.func.coalesce(db.func.sum(signed_amount()), 0.0)).filter(
+                Transaction.account_id == self.id,
+                Transaction.id > checkpoint.last_transaction_id,
+                db.func.likely(Transaction.date < moment),
+            ).scalar()
+            return checkpoint.balance + tail
+        later = (db.select(db.func.coalesce(db.func.sum(signed_amount()), 0.0))
+                 .where(Transaction.account_id == self.id, Transaction.date >= moment)
+                 .scalar_subquery())
+        return db.session.query(Account.balance - later).filter(Account.id == self.id).scalar()
+
+    def balance_as_of(self, day: datetime.date) -> float:
+        # Solde en fin de journée
+        return self.balance_before(datetime.datetime.combine(day + datetime.timedelta(days=1), datetime.time.min))
+
+    def monthly_statement(self, month: datetime.date) -> Statement:
+        month, next_month = month_bounds(month)
+        opening_balance = self.balance_before(datetime.datetime.combine(month, datetime.time.min))
+        transactions = filter_transaction_dates(
+            Transaction.query.filter(Transaction.account_id == self.id), month, next_month - datetime.timedelta(days=1)
+        ).order_by(Transaction.date, Transaction.id).all()
+        closing_balance = opening_balance + sum(transaction.signed_amount for transaction in transactions)
+        return Statement(month, opening_balance, closing_balance, transactions)
+
     def apply_monthly_interest(self):
+        # La date des intérêts est marquée d'abord, sous la condition d'échéance : l'UPDATE prend
+        # le verrou d'écriture, l'intérêt est donc calculé sur le solde courant et crédité par un
+        # UPDATE relatif, sans écraser une opération concurrente.
         today = datetime.date.today()
-        if today.month != self.last_interest_date.month or today.year != self.last_interest_date.year:
-            interest = self.balance * (self.interest_rate / 12)
-            self.balance += interest
-            new_transaction = Transaction(amount=interest, transaction_type="Intérêts", account=self)
-            db.session.add(new_transaction)
-            self.last_interest_date = today
-            db.session.commit()
+
+        def apply() -> bool:
+            due = db.session.execute(
+                db.update(Account).where(Account.id == self.id, interest_due(today)).values(last_interest_date=today),
+                execution_options={'synchronize_session': False},
+            )
+            if due.rowcount != 1:
+                return False
+            interest = db.session.execute(
+                db.select(monthly_interest(Account.balance, Account.interest_rate)).where(Account.id == self.id)
+            ).scalar()
+            credit(self.id, interest)
+            db.session.expire(self, ['balance', 'last_interest_date'])
+            db.session.add(Transaction(amount=interest, transaction_type=INTEREST_TYPE, account_id=self.id))
+            return True
+        commit_posting(apply)
 
     def __str__(self):
         return f"Compte {self.name}: Solde = {self.balance:.2f}€, Taux d'intérêt = {self.interest_rate*100:.2f}%"
 
+class AccountView(NamedTuple):
+    # Lecture seule, partageable entre threads contrairement à une instance liée à une session
+    id: int
+    name: str
+    balance: float
+    interest_rate: float
+    last_transaction_id: int
+
+def load_account_view(account_id: int) -> Optional[AccountView]:
+    last_transaction_id = (
+        db.select(db.func.coalesce(db.func.max(Transaction.id), 0))
+        .where(Transaction.account_id == Account.id)
+        .scalar_subquery()
+    )
+    row = db.session.execute(
+        db.select(Account.id, Account.name, Account.balance, Account.interest_rate, last_transaction_id)
+        .where(Account.id == account_id)
+    ).one_or_none()
+    return AccountView(*row) if row else None
+
+def account_view_is_current(account_id: int, view: AccountView) -> bool:
+    # Une écriture validée par un autre worker n'invalide pas ce cache : la dernière transaction
+    # du compte, lue dans l'index (account_id, id), sert de version partagée entre processus
+    last_transaction_id = db.session.execute(
+        db.select(db.func.coalesce(db.func.max(Transaction.id), 0)).where(Transaction.account_id == account_id)
+    ).scalar()
+    return last_transaction_id == view.last_transaction_id
+
+def get_account_view(account_id: int) -> Optional[AccountView]:
+    return account_cache.get(account_id, load_account_view, account_view_is_current)
+
+def account_etag(view: AccountView, *parts) -> str:
+    # Toute opération ajoute une transaction : dernière transaction + solde identifient l'état
+    state = repr((view.id, view.last_transaction_id, view.balance) + parts)
+    return hashlib.blake2b(state.encode(), digest_size=12).hexdigest()
+
+def conditional_page(etag: str, render) -> Response:
+    # Un message flash en attente serait affiché par la page : ni 304 ni ETag dans ce cas
+    if session.get('_flashes'):
+        return make_response(render())
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = make_response(render())
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+def render_history_page(key: Tuple) -> Markup:
+    account_id, _, start, end, next_cursor, prev_cursor = key
+    page = db.session.get(Account, account_id).get_transactions_page(
+        next_cursor=next_cursor, prev_cursor=prev_cursor, start=start, end=end,
+    )
+    return Markup(render_template('_history_page.html', transactions=page.transactions, page=page, start=start, end=end))
+
+def parse_date(value: Optional[str]) -> Optional[datetime.date]:
+    if not value:
+        return None
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        return None
+
 @app.route('/')
 def home():
     return render_template('home.html')
@@ -83,6 +717,9 @@ def create_account():
         else:
             new_account = Account(name=name, balance=initial_balance, interest_rate=interest_rate, pin=pin)
             db.session.add(new_account)
+            db.session.flush()
+            # Point de contrôle d'ouverture : le compte n'a encore aucune transaction
+            db.session.add(BalanceCheckpoint(account_id=new_account.id, balance=initial_balance))
             db.session.commit()
             flash(f"Compte '{name}' créé avec succès.", 'success')
             return redirect(url_for('home'))
@@ -104,18 +741,22 @@ def login():
     return render_template('login.html')
 
 @app.route('/account')
+@read_only
 def account():
     if 'account_id' not in session:
         return redirect(url_for('login'))
-    account = Account.query.get(session['account_id'])
-    return render_template('account.html', account=account)
+    account = get_account_view(session['account_id'])
+    if account is None:
+        session.pop('account_id', None)
+        return redirect(url_for('login'))
+    return conditional_page(account_etag(account), lambda: render_template('account.html', account=account))
 
 @app.route('/deposit', methods=['GET', 'POST'])
 def deposit():
     if 'account_id' not in session:
         return redirect(url_for('login'))
-    account = Account.query.get(session['account_id'])
     if request.method == 'POST':
+        account = Account.query.get(session['account_id'])
         amount = float(request.form['amount'])
         account.deposit(amount)
         flash(f"Dépôt de {amount:.2f}€ effectué.", 'success')
@@ -126,8 +767,8 @@ def deposit():
 def withdraw():
     if 'account_id' not in session:
         return redirect(url_for('login'))
-    account = Account.query.get(session['account_id'])
     if request.method == 'POST':
+        account = Account.query.get(session['account_id'])
         amount = float(request.form['amount'])
         if account.withdraw(amount):
             flash(f"Retrait de {amount:.2f}€ effectué.", 'success')
@@ -140,8 +781,8 @@ def withdraw():
 def transfer():
     if 'account_id' not in session:
         return redirect(url_for('login'))
-    account = Account.query.get(session['account_id'])
     if request.method == 'POST':
+        account = Account.query.get(session['account_id'])
         to_account_name = request.form['to_account_name']
         amount = float(request.form['amount'])
         pin = request.form['pin']
@@ -152,31 +793,7 @@ def transfer():
         
         to_account = Account.query.filter_by(name=to_account_name).first()
         if to_account:
-            if account.balance >= amount:
-                # Transaction sortante pour le compte émetteur
-                outgoing_transaction = Transaction(
-                    amount=amount,
-                    transaction_type="Transfert",
-                    description=f"vers {to_account_name}",
-                    is_incoming=False,
-                    account=account
-                )
-                account.balance -= amount
-                
-                # Transaction entrante pour le compte destinataire
-                incoming_transaction = Transaction(
-                    amount=amount,
-                    transaction_type="Transfert",
-                    description=f"de {account.name}",
-                    is_incoming=True,
-                    account=to_account
-                )
-                to_account.balance += amount
-                
-                db.session.add(outgoing_transaction)
-                db.session.add(incoming_transaction)
-                db.session.commit()
-                
+            if account.transfer(to_account, amount):
                 flash(f"Transfert de {amount:.2f}€ effectué vers {to_account_name}.", 'success')
             else:
                 flash("Transfert échoué. Solde insuffisant.", 'error')
@@ -186,12 +803,390 @@ def transfer():
     return render_template('transfer.html')
 
 @app.route('/history')
+@read_only
 def history():
     if 'account_id' not in session:
         return redirect(url_for('login'))
+    account = get_account_view(session['account_id'])
+    if account is None:
+        session.pop('account_id', None)
+        return redirect(url_for('login'))
+    start = parse_date(request.args.get('start'))
+    end = parse_date(request.args.get('end'))
+    key = (account.id, account.last_transaction_id, start, end, request.args.get('next'), request.args.get('prev'))
+
+    def render() -> str:
+        fragment = history_cache.get(key, render_history_page)
+        return render_template('history.html', fragment=fragment, start=start, end=end)
+    return conditional_page(account_etag(account, 'history', *key[2:]), render)
+
+def sse(event: str, data: Dict, event_id: Optional[int] = None) -> str:
+    lines = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{lines}event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@app.route('/account/stream')
+@read_only
+def account_stream():
+    # Flux Server-Sent Events du compte connecté : « transaction » pour chaque opération validée,
+    # puis « balance » avec le nouveau solde. Un abonné dont la file a débordé (ou qui se reconnecte
+    # avec Last-Event-ID) relit en base les transactions qu'il n'a pas reçues.
+    if 'account_id' not in session:
+        return jsonify(error="Non authentifié."), 401
+    account_id = session['account_id']
+    try:
+        last_sent = int(request.headers.get('Last-Event-ID', 0))
+    except ValueError:
+        last_sent = 0
+    heartbeat = app.config['STREAM_HEARTBEAT']
+
+    def stream():
+        nonlocal last_sent
+        subscription = event_hub.subscribe(account_id)
+        try:
+            yield f"retry: {int(heartbeat * 1000)}\n\n"
+            stale = bool(last_sent)
+            events: List[Dict] = []
+            while True:
+                if stale:
+                    missed = (Transaction.query
+                              .filter(Transaction.account_id == account_id, Transaction.id > last_sent)
+                              .order_by(Transaction.id).limit(STREAM_RESYNC_LIMIT + 1).all())
+                    if len(missed) > STREAM_RESYNC_LIMIT:
+                        # Trop de retard : le client recharge la page plutôt que de tout rejouer
+                        yield sse('reload', {})
+                        return
+                    events = [transaction.to_dict() for transaction in missed] + events
+                for transaction in events:
+                    if transaction['id'] > last_sent:
+                        last_sent = transaction['id']
+                        yield sse('transaction', transaction, transaction['id'])
+                account = get_account_view(account_id)
+                # La session ne garde pas de connexion du pool entre deux événements
+                db.session.close()
+                if account is None:
+                    return
+                yield sse('balance', {'balance': account.balance, 'last_transaction_id': account.last_transaction_id})
+
+                received = subscription.get(heartbeat)
+                while received is None:
+                    yield ": heartbeat\n\n"
+                    received = subscription.get(heartbeat)
+                events, stale = received
+        finally:
+            event_hub.unsubscribe(subscription)
+
+    return Response(
+        stream_with_context(stream()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+@app.route('/history/export')
+@read_only
+def history_export():
+    if 'account_id' not in session:
+        return redirect(url_for('login'))
+    export_format = request.args.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        abort(400)
+    formatter, mimetype = EXPORT_FORMATS[export_format]
+    account_id = session['account_id']
+    rows = iter_transaction_rows(account_id, parse_date(request.args.get('start')), parse_date(request.args.get('end')))
+    return Response(
+        stream_with_context(formatter(rows)),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename=historique-{account_id}.{export_format}'},
+    )
+
+@app.route('/api/balance')
+@read_only
+def api_balance():
+    if 'account_id' not in session:
+        return jsonify(error="Non authentifié."), 401
+    account = Account.query.get(session['account_id'])
+    day = parse_date(request.args.get('date')) or datetime.date.today()
+    if day == datetime.date.max:
+        # Le solde de fin de journée se lit au lendemain, qui n'est pas représentable
+        return jsonify(error="Date invalide."), 400
+    return jsonify(account=account.name, date=day.isoformat(), balance=round(account.balance_as_of(day), 2))
+
+@app.route('/api/statement')
+@read_only
+def api_statement():
+    if 'account_id' not in session:
+        return jsonify(error="Non authentifié."), 401
     account = Account.query.get(session['account_id'])
-    transactions = account.get_transactions()
-    return render_template('history.html', transactions=transactions)
+    month = parse_date(f"{request.args.get('month')}-01") or datetime.date.today().replace(day=1)
+    if month >= LAST_MONTH:
+        # Le relevé est borné par le premier jour du mois suivant, qui n'est pas représentable
+        return jsonify(error="Mois invalide."), 400
+    statement = account.monthly_statement(month)
+    return jsonify(
+        account=account.name,
+        month=statement.month.strftime('%Y-%m'),
+        opening_balance=round(statement.opening_balance, 2),
+        closing_balance=round(statement.closing_balance, 2),
+        transactions=[transaction.to_dict() for transaction in statement.transactions],
+    )
+
+def month_offset(month: datetime.date, months: int) -> datetime.date:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+@app.route('/api/summary')
+@read_only
+def api_summary():
+    # Tableau de bord mensuel lu dans MonthlySummary : une lecture d'index par compte et par mois,
+    # quelle que soit la taille de l'historique. Paramètres from/to au format AAAA-MM.
+    if 'account_id' not in session:
+        return jsonify(error="Non authentifié."), 401
+    account = get_account_view(session['account_id'])
+    if account is None:
+        return jsonify(error="Non authentifié."), 401
+    last = parse_date(f"{request.args.get('to')}-01") or datetime.date.today().replace(day=1)
+    first = parse_date(f"{request.args.get('from')}-01")
+    if first is None:
+        try:
+            first = month_offset(last, -11)
+        except ValueError:
+            first = datetime.date.min  # moins de 12 mois avant l'an 1
+    # Nombre de mois calculé sans construire de date : aucune ne sort du calendrier (an 1 à 9999)
+    span = (last.year - first.year) * 12 + last.month - first.month + 1
+    if not 0 < span <= SUMMARY_MAX_MONTHS:
+        return jsonify(error=f"Période invalide (au plus {SUMMARY_MAX_MONTHS} mois)."), 400
+
+    months = {}
+    for offset in range(span):
+        month = month_offset(first, offset)
+        months[month] = {'month': month.isoformat()[:7], 'credits': 0.0, 'debits': 0.0, 'operations': []}
+    summaries = MonthlySummary.query.filter(
+        MonthlySummary.account_id == account.id, MonthlySummary.month >= first, MonthlySummary.month <= last,
+    ).order_by(MonthlySummary.month, MonthlySummary.transaction_type, MonthlySummary.is_incoming)
+    for summary in summaries:
+        entry = months[summary.month]
+        outgoing = summary.transaction_type == WITHDRAWAL_TYPE or (
+            summary.transaction_type == TRANSFER_TYPE and not summary.is_incoming)
+        entry['debits' if outgoing else 'credits'] += summary.total
+        entry['operations'].append({
+            'transaction_type': summary.transaction_type,
+            'is_incoming': summary.is_incoming,
+            'count': summary.count,
+            'total': round(summary.total, 2),
+        })
+    for entry in months.values():
+        entry['net'] = round(entry['credits'] - entry['debits'], 2)
+        entry['credits'] = round(entry['credits'], 2)
+        entry['debits'] = round(entry['debits'], 2)
+    return jsonify(account=account.name, months=list(months.values()))
+
+def fts_query(text: str) -> str:
+    # Chaque mot devient une expression entre guillemets (ET implicite) ; « mot* » cherche un préfixe
+    terms = []
+    for word in text.split():
+        prefix = word.endswith('*')
+        word = word.rstrip('*').replace('"', '""')
+        if word:
+            terms.append(f'"{word}"*' if prefix else f'"{word}"')
+    return ' '.join(terms)
+
+def search_transactions(text: str = '', transaction_type: Optional[str] = None, account_id: Optional[int] = None,
+                        min_amount: Optional[float] = None, max_amount: Optional[float] = None,
+                        start: Optional[datetime.date] = None, end: Optional[datetime.date] = None,
+                        cursor: Optional[str] = None, limit: int = SEARCH_PAGE_SIZE) -> Tuple[List, Optional[str]]:
+    # Du plus récent au plus ancien, par curseur. Sans texte, l'ordre et le curseur portent sur
+    # (date, id) comme l'historique, et les bornes de montant et de date passent par les index
+    # B-tree. Avec du texte, l'index FTS5 est parcouru par rowid décroissant et s'arrête dès la
+    # page remplie, même pour un mot fréquent : l'ordre est alors celui des ids (d'insertion).
+    query = db.session.query(Transaction, Account.name).join(Account, Account.id == Transaction.account_id)
+    position = decode_cursor(cursor)
+    if text:
+        query = query.join(transaction_search, transaction_search.c.rowid == Transaction.id).filter(
+            transaction_search.c.transaction_fts.op('MATCH')(text))
+        if position:
+            query = query.filter(transaction_search.c.rowid < position[1])
+        order = [transaction_search.c.rowid.desc()]
+    else:
+        if position:
+            query = query.filter(db.tuple_(Transaction.date, Transaction.id) < position)
+        order = [Transaction.date.desc(), Transaction.id.desc()]
+    if transaction_type:
+        query = query.filter(Transaction.transaction_type == transaction_type)
+    if account_id is not None:
+        query = query.filter(Transaction.account_id == account_id)
+    if min_amount is not None:
+        query = query.filter(Transaction.amount >= min_amount)
+    if max_amount is not None:
+        query = query.filter(Transaction.amount <= max_amount)
+    query = filter_transaction_dates(query, start, end)
+    rows = query.order_by(*order).limit(limit + 1).all()
+    next_cursor = encode_cursor(rows[limit - 1][0]) if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+@app.route('/api/search')
+@read_only
+def api_search():
+    # Recherche tous comptes confondus, réservée aux porteurs du jeton de l'API. Paramètres :
+    # q (mots de la description), type, account (nom), min_amount, max_amount, start, end
+    # (AAAA-MM-JJ, inclus), limit, cursor (champ next_cursor de la page précédente).
+    denied = check_api_token()
+    if denied:
+        return denied
+    args = request.args
+    try:
+        amounts = [float(args[name]) if args.get(name) else None for name in ('min_amount', 'max_amount')]
+        dates = [datetime.date.fromisoformat(args[name]) if args.get(name) else None for name in ('start', 'end')]
+        limit = int(args.get('limit', SEARCH_PAGE_SIZE))
+    except ValueError:
+        return jsonify(error="Paramètres invalides."), 400
+    if not 0 < limit <= SEARCH_PAGE_MAX or any(amount is not None and not math.isfinite(amount) for amount in amounts):
+        return jsonify(error="Paramètres invalides."), 400
+    account_id = None
+    if args.get('account'):
+        account_id = db.session.scalar(db.select(Account.id).where(Account.name == args['account']))
+        if account_id is None:
+            return jsonify(results=[], next_cursor=None)
+    rows, next_cursor = search_transactions(fts_query(args.get('q', '')), args.get('type') or None, account_id,
+                                            *amounts, *dates, args.get('cursor'), limit)
+    return jsonify(
+        results=[dict(transaction.to_dict(), account=name) for transaction, name in rows],
+        next_cursor=next_cursor,
+    )
+
+def parse_posting(item, accounts: Dict[str, 'Account']) -> Posting:
+    # Lève ValueError avec un message destiné au client
+    if not isinstance(item, dict):
+        raise ValueError("Opération invalide.")
+    kind = item.get('type')
+    if kind not in ('deposit', 'withdraw', 'transfer'):
+        raise ValueError("Type d'opération inconnu.")
+    amount = item.get('amount')
+    if isinstance(amount, bool) or not isinstance(amount, (int, float)):
+        raise ValueError("Montant invalide.")
+    try:
+        amount = float(amount)  # un entier JSON trop grand pour un flottant lève OverflowError
+    except OverflowError:
+        raise ValueError("Montant invalide.")
+    if not (math.isfinite(amount) and amount > 0):
+        raise ValueError("Montant invalide.")
+    account = accounts.get(item.get('account'))
+    if account is None:
+        raise ValueError("Compte non trouvé.")
+    if kind == 'transfer':
+        to_account = accounts.get(item.get('to_account'))
+        if to_account is None:
+            raise ValueError("Compte destinataire non trouvé.")
+        return Posting(kind, account.id, amount, to_account_id=to_account.id)
+    return Posting(kind, account.id, amount, str(item.get('description') or ''))
+
+def check_api_token():
+    # None si l'en-tête porte le jeton de l'API, sinon la réponse d'erreur
+    token = app.config['API_TOKEN']
+    if not token:
+        abort(404)
+    if not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return jsonify(error="Non authentifié."), 401
+    return None
+
+@app.route('/api/postings', methods=['POST'])
+def api_postings():
+    # Lot d'opérations validé en une seule transaction. Corps : une liste d'opérations, ou
+    # {"operations": [...], "atomic": true} pour tout annuler au premier échec.
+    denied = check_api_token()
+    if denied:
+        return denied
+    payload = request.get_json(silent=True)
+    atomic = False
+    if isinstance(payload, dict):
+        atomic = bool(payload.get('atomic', False))
+        payload = payload.get('operations')
+    if not isinstance(payload, list):
+        return jsonify(error="Liste d'opérations attendue."), 400
+    if len(payload) > POSTING_BATCH_MAX:
+        return jsonify(error=f"Au plus {POSTING_BATCH_MAX} opérations par lot."), 413
+
+    # Tous les comptes du lot en une requête
+    names = set()
+    for item in payload:
+        if isinstance(item, dict):
+            names.update(name for name in (item.get('account'), item.get('to_account')) if isinstance(name, str))
+    accounts = {account.name: account for account in Account.query.filter(Account.name.in_(names))} if names else {}
+
+    results: List[Dict] = []
+    postings: List[Tuple[int, Posting]] = []
+    for index, item in enumerate(payload):
+        try:
+            postings.append((index, parse_posting(item, accounts)))
+            results.append({'index': index, 'status': 'ok'})
+        except ValueError as exc:
+            results.append({'index': index, 'status': 'invalid', 'error': str(exc)})
+    by_id = {account.id: account for account in accounts.values()}
+
+    def work() -> bool:
+        failed = False
+        for index, posting in postings:
+            applied = apply_posting(posting, by_id)
+            results[index] = {'index': index, 'status': 'ok'} if applied else \
+                {'index': index, 'status': 'insufficient_funds', 'error': "Solde insuffisant."}
+            failed = failed or not applied
+        if atomic and (failed or len(postings) < len(payload)):
+            db.session.rollback()
+            return False
+        db.session.commit()
+        return True
+
+    if postings:
+        committed = retry_on_lock(work)
+    else:
+        committed = not (atomic and payload)
+    succeeded = sum(result['status'] == 'ok' for result in results)
+    return jsonify(
+        committed=committed,
+        applied=succeeded if committed else 0,
+        failed=len(results) - succeeded,
+        results=results,
+    ), 200 if committed else 409
+
+@app.route('/api/projection', methods=['POST'])
+def api_projection():
+    # Corps : {"months": 12, "scenarios": {"base": 0, "hausse": [0, 0, 0.01]}, "accounts": ["Dupont"]}
+    # Un scénario décale le taux annuel de tous les comptes, globalement ou mois par mois.
+    denied = check_api_token()
+    if denied:
+        return denied
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return jsonify(error="Objet JSON attendu."), 400
+    months = payload.get('months', 12)
+    scenarios = payload.get('scenarios') or {'base': 0.0}
+    names = payload.get('accounts') or []
+    if isinstance(months, bool) or not isinstance(months, int) or not isinstance(scenarios, dict) \
+            or not isinstance(names, list):
+        return jsonify(error="Paramètres invalides."), 400
+    if len(scenarios) > PROJECTION_MAX_SCENARIOS:
+        return jsonify(error=f"Au plus {PROJECTION_MAX_SCENARIOS} scénarios par requête."), 400
+    try:
+        ids, result = project_portfolio(months, scenarios)
+    except ImportError:
+        return jsonify(error="NumPy est requis pour les projections."), 501
+    except ValueError as exc:
+        return jsonify(error=str(exc)), 400
+
+    accounts = []
+    for account_id, name in db.session.execute(
+        db.select(Account.id, Account.name).where(Account.name.in_([name for name in names if isinstance(name, str)]))
+    ):
+        index = int(ids.searchsorted(account_id))
+        if index == len(ids) or ids[index] != account_id:
+            continue  # compte créé après la lecture de la projection
+        accounts.append({
+            'name': name,
+            'balance': float(result.initial[index]),
+            'scenarios': {
+                scenario: {'final_balance': float(result.final[i, index]), 'interest': float(result.interest[i, index])}
+                for i, scenario in enumerate(result.scenarios)
+            },
+        })
+    return jsonify(months=result.months, accounts_count=len(ids), scenarios=result.summary(), accounts=accounts)
 
 @app.route('/logout')
 def logout():
@@ -199,12 +1194,511 @@ def logout():
     flash('Vous avez été déconnecté.', 'info')
     return redirect(url_for('home'))
 
+# Écriture groupée (optionnelle) : un thread unique valide ensemble les opérations
+# reçues de plusieurs requêtes, au lieu d'un commit (et d'un fsync) par opération.
+posting_writer: Optional[GroupCommitWriter] = None
+
+def apply_postings(postings: List[Posting]) -> List[bool]:
+    with app.app_context():
+        account_ids = {posting.account_id for posting in postings}
+        account_ids.update(posting.to_account_id for posting in postings if posting.to_account_id)
+        accounts = {account.id: account for account in Account.query.filter(Account.id.in_(account_ids))}
+
+        def work() -> List[bool]:
+            results = [apply_posting(posting, accounts) for posting in postings]
+            db.session.commit()
+            return results
+        return retry_on_lock(work)
+
+def apply_posting(posting: Posting, accounts: Dict[int, 'Account']) -> bool:
+    # Applique une opération dans la session courante, sans la valider
+    account = accounts[posting.account_id]
+    if posting.kind == 'deposit':
+        return account._apply_deposit(posting.amount, posting.description)
+    if posting.kind == 'withdraw':
+        return account._apply_withdraw(posting.amount, posting.description)
+    return account._apply_transfer(accounts[posting.to_account_id], posting.amount)
+
+def enable_group_commit(max_batch: int = 256, max_delay: float = 0.002):
+    global posting_writer
+    disable_group_commit()
+    posting_writer = GroupCommitWriter(apply_postings, max_batch, max_delay)
+
+def disable_group_commit():
+    global posting_writer
+    if posting_writer:
+        posting_writer.close()
+        posting_writer = None
+
+def account_id_chunks(chunk_size: int, start_id: Optional[int] = None):
+    # Découpe [min(id), max(id)] en tranches [début, fin[ ; renvoie aussi max(id) pour la progression
+    low, high = db.session.query(db.func.min(Account.id), db.func.max(Account.id)).one()
+    if low is None:
+        return
+    if start_id is not None:
+        low = max(low, start_id)
+    for chunk_start in range(low, high + 1, chunk_size):
+        yield chunk_start, min(chunk_start + chunk_size, high + 1), high
+
+def take_balance_checkpoints(condition, balance=Account.balance) -> int:
+    # À appeler après une première écriture de la transaction : SQLite tient alors le verrou
+    # d'écriture, max(id) et les soldes lus forment un état cohérent.
+    last_transaction_id = db.select(db.func.coalesce(db.func.max(Transaction.id), 0)).scalar_subquery()
+    return db.session.execute(db.insert(BalanceCheckpoint).from_select(
+        ['account_id', 'taken_at', 'balance', 'last_transaction_id'],
+        db.select(
+            Account.id,
+            db.literal(datetime.datetime.utcnow(), db.DateTime),
+            balance,
+            last_transaction_id,
+        ).where(condition),
+    )).rowcount
+
+def interest_due(today: datetime.date):
+    # Même règle que bankcore.is_interest_due : pas encore d'intérêts ce mois-ci
+    month_start, next_month = month_bounds(today)
+    return db.or_(Account.last_interest_date < month_start, Account.last_interest_date >= next_month)
+
+def apply_monthly_interest_bulk(chunk_size: int = INTEREST_CHUNK_SIZE, start_id: Optional[int] = None,
+                                progress=None) -> int:
+    # Traite les comptes par tranches d'id : un INSERT ... SELECT des transactions « Intérêts »,
+    # de leurs agrégats mensuels et des points de contrôle de solde, puis un UPDATE ensembliste
+    # des soldes, validés ensemble à chaque tranche (rejouée si SQLite reste verrouillé).
+    # Les comptes déjà crédités ce mois-ci sont exclus : une exécution interrompue se relance sans doublon.
+    today = datetime.date.today()
+    now = datetime.datetime.utcnow()
+    interest = monthly_interest(Account.balance, Account.interest_rate)
+    processed = 0
+    for chunk_start, chunk_end, high in account_id_chunks(chunk_size, start_id):
+        in_chunk = db.and_(Account.id >= chunk_start, Account.id < chunk_end, interest_due(today))
+        def work() -> int:
+            db.session.execute(db.insert(Transaction).from_select(
+                ['amount', 'transaction_type', 'is_incoming', 'date', 'account_id'],
+                db.select(
+                    interest,
+                    db.literal(INTEREST_TYPE, db.String),
+                    db.literal(True, db.Boolean),
+                    db.literal(now, db.DateTime),
+                    Account.id,
+                ).where(in_chunk),
+            ))
+            db.session.execute(upsert_monthly_summaries(sqlite_insert(MonthlySummary).from_select(
+                SUMMARY_COLUMNS,
+                db.select(
+                    Account.id,
+                    db.literal(now.date().replace(day=1), db.Date),
+                    db.literal(INTEREST_TYPE, db.String),
+                    db.literal(True, db.Boolean),
+                    db.literal(1, db.Integer),
+                    interest,
+                ).where(in_chunk),
+            )))
+            take_balance_checkpoints(in_chunk, Account.balance + interest)
+            touch_all_accounts()
+            result = db.session.execute(
+                db.update(Account).where(in_chunk).values(balance=Account.balance + interest, last_interest_date=today),
+                execution_options={'synchronize_session': False},
+            )
+            db.session.commit()
+            return result.rowcount
+        processed += retry_on_lock(work)
+        if progress:
+            progress(chunk_end - 1, high, processed)
+    return processed
+
 def apply_monthly_interest_all_accounts():
-    accounts = Account.query.all()
-    for account in accounts:
-        account.apply_monthly_interest()
+    return apply_monthly_interest_bulk()
 
-if __name__ == '__main__':
+@app.cli.command('apply-interest')
+@click.option('--chunk-size', default=INTEREST_CHUNK_SIZE, show_default=True, help="Nombre d'ids par tranche.")
+@click.option('--start-id', type=int, default=None, help="Reprendre à partir de cet id de compte.")
+def apply_interest_command(chunk_size: int, start_id: Optional[int]):
+    started = time.perf_counter()
+
+    def progress(last_id: int, max_id: int, processed: int):
+        click.echo(f"\r  id {last_id}/{max_id} - {processed} compte(s) crédité(s)", nl=False, err=True)
+
+    processed = apply_monthly_interest_bulk(chunk_size, start_id, progress)
+    click.echo(err=True)
+    click.echo(f"Intérêts appliqués à {processed} compte(s) en {time.perf_counter() - started:.1f}s.")
+
+def rebuild_monthly_summaries(chunk_size: int = INTEREST_CHUNK_SIZE, progress=None) -> int:
+    # Recalcule les agrégats tranche de comptes par tranche : suppression puis GROUP BY sur les
+    # transactions de la tranche, validés ensemble. Les écritures concurrentes attendent le verrou
+    # SQLite de la tranche en cours : aucune n'est comptée deux fois ni perdue.
+    month = db.func.date(Transaction.date, 'start of month')
+    is_incoming = db.func.coalesce(Transaction.is_incoming, db.true())
+    rows = 0
+    for chunk_start, chunk_end, high in account_id_chunks(chunk_size):
+        def work() -> int:
+            db.session.execute(db.delete(MonthlySummary).where(
+                MonthlySummary.account_id >= chunk_start, MonthlySummary.account_id < chunk_end))
+            result = db.session.execute(db.insert(MonthlySummary).from_select(
+                SUMMARY_COLUMNS,
+                db.select(Transaction.account_id, month, Transaction.transaction_type, is_incoming,
+                          db.func.count(), db.func.sum(Transaction.amount))
+                .where(Transaction.account_id >= chunk_start, Transaction.account_id < chunk_end)
+                .group_by(Transaction.account_id, month, Transaction.transaction_type, is_incoming),
+            ))
+            db.session.commit()
+            return result.rowcount
+        rows += retry_on_lock(work)
+        if progress:
+            progress(chunk_end - 1, high, rows)
+    return rows
+
+@app.cli.command('rebuild-monthly-summaries')
+@click.option('--chunk-size', default=INTEREST_CHUNK_SIZE, show_default=True, help="Nombre d'ids par tranche.")
+def rebuild_monthly_summaries_command(chunk_size: int):
+    started = time.perf_counter()
+
+    def progress(last_id: int, max_id: int, rows: int):
+        click.echo(f"\r  id {last_id}/{max_id} - {rows} agrégat(s)", nl=False, err=True)
+
+    rows = rebuild_monthly_summaries(chunk_size, progress)
+    click.echo(err=True)
+    click.echo(f"{rows} agrégat(s) mensuel(s) recalculé(s) en {time.perf_counter() - started:.1f}s.")
+
+def rebuild_search_index(connection) -> int:
+    connection.exec_driver_sql("INSERT INTO transaction_fts (transaction_fts) VALUES ('delete-all')")
+    return connection.exec_driver_sql(
+        "INSERT INTO transaction_fts (rowid, description) "
+        "SELECT id, description FROM \"transaction\" WHERE coalesce(description, '') != ''"
+    ).rowcount
+
+def init_db():
+    db.create_all()
+    # create_all ignore les tables existantes : on ajoute les index manquants
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
+    with db.engine.begin() as connection:
+        exists = connection.exec_driver_sql("SELECT 1 FROM sqlite_master WHERE name = 'transaction_fts'").first()
+        for statement in SEARCH_INDEX_DDL:
+            connection.exec_driver_sql(statement)
+        if not exists:
+            # Base existante : l'index plein texte est alimenté une fois avec l'historique
+            rebuild_search_index(connection)
+
+@app.cli.command('init-db')
+def init_db_command():
+    init_db()
+    print("Base de données initialisée.")
+
+@app.cli.command('rebuild-search-index')
+def rebuild_search_index_command():
+    started = time.perf_counter()
+    with db.engine.begin() as connection:
+        indexed = rebuild_search_index(connection)
+    click.echo(f"{indexed} description(s) indexée(s) en {time.perf_counter() - started:.1f}s.")
+
+@app.cli.command('export-history')
+@click.argument('name')
+@click.option('--format', 'export_format', type=click.Choice(list(EXPORT_FORMATS)), default='csv', show_default=True)
+@click.option('--start', help="Date de début incluse (AAAA-MM-JJ).")
+@click.option('--end', help="Date de fin incluse (AAAA-MM-JJ).")
+@click.option('--output', type=click.File('w', encoding='utf-8'), default='-', help="Fichier de sortie (défaut : sortie standard).")
+def export_history_command(name: str, export_format: str, start: Optional[str], end: Optional[str], output):
+    account = Account.query.filter_by(name=name).first()
+    if not account:
+        raise click.ClickException(f"Compte '{name}' introuvable.")
+    formatter, _ = EXPORT_FORMATS[export_format]
+    for chunk in formatter(iter_transaction_rows(account.id, parse_date(start), parse_date(end))):
+        output.write(chunk)
+
+def read_account_records(stream, import_format: str):
+    # (numéro de ligne, enregistrement) en flux ; une ligne JSON illisible est transmise
+    # telle quelle pour être rejetée
+    if import_format == 'csv':
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record
+        return
+    for line_number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError:
+            yield line_number, line.rstrip('\n')
+
+def parse_account_record(record) -> Dict:
+    # Mêmes champs que le formulaire de création ; lève ValueError avec le motif du rejet
+    if not isinstance(record, dict):
+        raise ValueError("Ligne illisible.")
+    name = record.get('name')
+    if not isinstance(name, str) or not name.strip() or len(name.strip()) > 100:
+        raise ValueError("Nom invalide.")
+    try:
+        balance = float(record.get('initial_balance'))
+        interest_rate = float(record.get('interest_rate'))
+    except (TypeError, ValueError):
+        raise ValueError("Solde ou taux d'intérêt invalide.")
+    if not math.isfinite(balance) or not math.isfinite(interest_rate):
+        raise ValueError("Solde ou taux d'intérêt invalide.")
+    pin = record.get('pin')
+    if not isinstance(pin, str) or not 0 < len(pin) <= 4:
+        raise ValueError("Code PIN invalide.")
+    return {'name': name.strip(), 'balance': balance, 'interest_rate': interest_rate, 'pin': pin}
+
+def import_accounts(records, reject, chunk_size: int = IMPORT_CHUNK_SIZE, progress=None) -> Tuple[int, int]:
+    # Par tranche : validation, doublons du fichier, noms déjà en base (une requête IN),
+    # insertion groupée (executemany) et points de contrôle d'ouverture, validés ensemble.
+    # Seule la tranche courante est en mémoire.
+    inserted = rejected = 0
+    records = iter(records)
+    while True:
+        chunk = list(itertools.islice(records, chunk_size))
+        if not chunk:
+            break
+        rows: Dict[str, Tuple[int, object, Dict]] = {}
+        for line_number, record in chunk:
+            try:
+                row = parse_account_record(record)
+            except ValueError as exc:
+                reject(line_number, record, str(exc))
+                rejected += 1
+                continue
+            if row['name'] in rows:
+                reject(line_number, record, "Nom en double dans le fichier.")
+                rejected += 1
+                continue
+            rows[row['name']] = (line_number, record, row)
+
+        if rows:
+            for name in db.session.scalars(db.select(Account.name).where(Account.name.in_(list(rows)))):
+                line_number, record, _ = rows.pop(name)
+                reject(line_number, record, "Un compte avec ce nom existe déjà.")
+                rejected += 1
+        if rows:
+            def work():
+                db.session.execute(db.insert(Account), [row for _, _, row in rows.values()])
+                take_balance_checkpoints(Account.name.in_(list(rows)))
+                db.session.commit()
+            retry_on_lock(work)
+            inserted += len(rows)
+        if progress:
+            progress(inserted, rejected)
+    return inserted, rejected
+
+@app.cli.command('import-accounts')
+@click.argument('source', type=click.File('r', encoding='utf-8-sig'))
+@click.option('--format', 'import_format', type=click.Choice(['csv', 'jsonl']), default=None,
+              help="Format du fichier (défaut : d'après l'extension).")
+@click.option('--chunk-size', default=IMPORT_CHUNK_SIZE, show_default=True, help="Comptes par transaction.")
+@click.option('--rejects', 'rejects_path', default=None,
+              help="Fichier CSV des lignes rejetées (défaut : <source>.rejets.csv).")
+def import_accounts_command(source, import_format: Optional[str], chunk_size: int, rejects_path: Optional[str]):
+    import_format = import_format or ('jsonl' if source.name.endswith(('.jsonl', '.json')) else 'csv')
+    rejects_path = rejects_path or (f"{source.name}.rejets.csv" if source.name != '<stdin>' else 'rejets.csv')
+    started = time.perf_counter()
+    with open(rejects_path, 'w', encoding='utf-8', newline='') as rejects_file:
+        writer = csv.writer(rejects_file)
+        writer.writerow(['line', 'reason', 'record'])
+
+        def reject(line_number: int, record, reason: str):
+            writer.writerow([line_number, reason, record if isinstance(record, str) else json.dumps(record, ensure_ascii=False)])
+
+        def progress(inserted: int, rejected: int):
+            click.echo(f"\r  {inserted} compte(s) importé(s), {rejected} rejet(s)", nl=False, err=True)
+
+        inserted, rejected = import_accounts(read_account_records(source, import_format), reject, chunk_size, progress)
+    click.echo(err=True)
+    click.echo(f"{inserted} compte(s) importé(s) en {time.perf_counter() - started:.1f}s, {rejected} rejet(s)"
+               + (f" (voir {rejects_path})." if rejected else "."))
+
+def project_portfolio(months: int, scenarios: Dict):
+    # NumPy n'est importé qu'ici : il reste une dépendance optionnelle de l'application
+    import numpy as np
+    from projection import project
+
+    # Lecture par blocs directement sur le curseur DBAPI : NumPy convertit des tuples bruts
+    # bien plus vite que des objets Row, et aucun objet Python par compte n'est conservé
+    blocks = []
+    cursor = db.session.connection().execute(
+        db.select(Account.id, db.func.coalesce(Account.balance, 0.0), Account.interest_rate)
+        .order_by(Account.id)
+    ).cursor
+    while rows := cursor.fetchmany(PROJECTION_BATCH_SIZE):
+        blocks.append(np.array(rows, dtype=np.float64))
+    data = np.concatenate(blocks) if blocks else np.empty((0, 3))
+    return data[:, 0].astype(np.int64), project(data[:, 1], data[:, 2], months, scenarios)
+
+def parse_scenario(value: str) -> Tuple[str, List[float]]:
+    # « nom=0,0,0.01 » ou « 0.01 » : décalages du taux annuel, mois par mois
+    name, _, shifts = value.rpartition('=')
+    try:
+        return name or shifts, [float(shift) for shift in shifts.split(',')]
+    except ValueError:
+        raise click.BadParameter(f"Scénario invalide : {value}")
+
+@app.cli.command('project-interest')
+@click.option('--months', default=12, show_default=True, help="Horizon de la projection, en mois.")
+@click.option('--scenario', 'scenarios', multiple=True,
+              help="Décalage du taux annuel, « nom=0,0,0.01 » pour un décalage par mois (répétable).")
+@click.option('--output', type=click.File('w', encoding='utf-8'), default=None,
+              help="Fichier CSV des résultats par compte.")
+def project_interest_command(months: int, scenarios: Tuple[str, ...], output):
+    started = time.perf_counter()
+    try:
+        ids, result = project_portfolio(months, dict(parse_scenario(value) for value in scenarios) or None)
+    except ImportError:
+        raise click.ClickException("NumPy est requis pour les projections (pip install numpy).")
+    except ValueError as exc:
+        raise click.ClickException(str(exc))
+    click.echo(f"{len(ids)} compte(s) projeté(s) sur {months} mois en {time.perf_counter() - started:.2f}s.")
+    for scenario in result.summary():
+        click.echo(f"  {scenario['scenario']}: {scenario['total_interest']:,.2f}€ d'intérêts, "
+                   f"encours final {scenario['final_total_balance']:,.2f}€")
+    if output:
+        writer = csv.writer(output)
+        writer.writerow(['id', 'balance'] + [f'final_{name}' for name in result.scenarios]
+                        + [f'interest_{name}' for name in result.scenarios])
+        columns = [ids, result.initial, *result.final, *result.interest]
+        for start in range(0, len(ids), PROJECTION_BATCH_SIZE):
+            writer.writerows(zip(*(column[start:start + PROJECTION_BATCH_SIZE].tolist() for column in columns)))
+
+@app.cli.command('checkpoint-balances')
+@click.option('--chunk-size', default=INTEREST_CHUNK_SIZE, show_default=True, help="Nombre d'ids par tranche.")
+def checkpoint_balances_command(chunk_size: int):
+    count = 0
+    for chunk_start, chunk_end, _ in account_id_chunks(chunk_size):
+        count += take_balance_checkpoints(db.and_(Account.id >= chunk_start, Account.id < chunk_end))
+        db.session.commit()
+    click.echo(f"{count} point(s) de contrôle enregistré(s).")
+
+class ReconcileResult(NamedTuple):
+    accounts: int
+    transactions: int
+    unverified: int  # comptes sans point de contrôle d'ouverture
+    discrepancies: List[Tuple[int, str, float, float, int]]  # id, nom, solde, solde attendu, transactions
+
+class ReconcileSummary(NamedTuple):
+    accounts: int
+    transactions: int
+    unverified: int
+    discrepancies: int
+
+def reconcile_chunk(chunk_start: int, chunk_end: int) -> ReconcileResult:
+    # Solde attendu = premier point de contrôle du compte + somme signée des transactions qui le
+    # suivent, en une requête groupée par tranche d'ids. Une seule instruction : soldes et
+    # transactions sont lus dans le même instantané, les écritures concurrentes ne faussent rien.
+    with app.app_context():
+        ranked = db.select(
+            BalanceCheckpoint.account_id,
+            BalanceCheckpoint.balance,
+            BalanceCheckpoint.last_transaction_id,
+            db.func.row_number().over(partition_by=BalanceCheckpoint.account_id,
+                                      order_by=(BalanceCheckpoint.taken_at, BalanceCheckpoint.id)).label('rank'),
+        ).where(BalanceCheckpoint.account_id >= chunk_start, BalanceCheckpoint.account_id < chunk_end).subquery()
+        opening = db.select(ranked).where(ranked.c.rank == 1).subquery()
+        tail = db.select(
+            Transaction.account_id,
+            db.func.sum(signed_amount()).label('total'),
+            db.func.count().label('count'),
+        ).join(opening, opening.c.account_id == Transaction.account_id).where(
+            Transaction.account_id >= chunk_start, Transaction.account_id < chunk_end,
+            Transaction.id > opening.c.last_transaction_id,
+        ).group_by(Transaction.account_id).subquery()
+        rows = db.session.execute(
+            db.select(Account.id, Account.name, Account.balance, opening.c.balance,
+                      db.func.coalesce(tail.c.total, 0.0), db.func.coalesce(tail.c.count, 0))
+            .outerjoin(opening, opening.c.account_id == Account.id)
+            .outerjoin(tail, tail.c.account_id == Account.id)
+            .where(Account.id >= chunk_start, Account.id < chunk_end)
+        ).all()
+        db.session.close()
+
+    accounts = transactions = unverified = 0
+    discrepancies = []
+    for account_id, name, balance, opening_balance, total, count in rows:
+        accounts += 1
+        transactions += count
+        if opening_balance is None:
+            unverified += 1
+            continue
+        expected = opening_balance + total
+        if abs((balance or 0.0) - expected) > RECONCILE_TOLERANCE:
+            discrepancies.append((account_id, name, balance or 0.0, expected, count))
+    return ReconcileResult(accounts, transactions, unverified, discrepancies)
+
+def dispose_inherited_engine():
+    # Processus fils : ne pas réutiliser les connexions SQLite héritées du parent
+    with app.app_context():
+        db.engine.dispose(close=False)
+
+def reconcile_ledger(chunk_size: int = INTEREST_CHUNK_SIZE, workers: int = 1, report=None, progress=None) -> ReconcileSummary:
+    # Les tranches sont réparties sur un pool de processus ; au plus deux tranches par processus
+    # sont en vol, et les écarts sont transmis à `report` au fil de l'eau : la mémoire reste bornée.
+    chunks = list(account_id_chunks(chunk_size))
+    db.session.close()
+    accounts = transactions = unverified = discrepancies = done = 0
+
+    def collect(result: ReconcileResult):
+        nonlocal accounts, transactions, unverified, discrepancies, done
+        done += 1
+        accounts += result.accounts
+        transactions += result.transactions
+        unverified += result.unverified
+        discrepancies += len(result.discrepancies)
+        if report:
+            for discrepancy in result.discrepancies:
+                report(*discrepancy)
+        if progress:
+            progress(done, len(chunks), accounts, transactions, discrepancies)
+
+    if workers <= 1:
+        for chunk_start, chunk_end, _ in chunks:
+            collect(reconcile_chunk(chunk_start, chunk_end))
+    else:
+        with ProcessPoolExecutor(workers, initializer=dispose_inherited_engine) as executor:
+            pending = set()
+            for index, (chunk_start, chunk_end, _) in enumerate(chunks):
+                pending.add(executor.submit(reconcile_chunk, chunk_start, chunk_end))
+                while pending and (len(pending) >= 2 * workers or index == len(chunks) - 1):
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        collect(future.result())
+    return ReconcileSummary(accounts, transactions, unverified, discrepancies)
+
+@app.cli.command('reconcile')
+@click.option('--chunk-size', default=INTEREST_CHUNK_SIZE, show_default=True, help="Nombre d'ids par tranche.")
+@click.option('--workers', default=os.cpu_count() or 1, show_default=True, help="Processus de calcul.")
+@click.option('--report', 'report_path', default='reconciliation.csv', show_default=True,
+              help="Fichier CSV des écarts constatés.")
+@click.pass_context
+def reconcile_command(ctx, chunk_size: int, workers: int, report_path: str):
+    started = time.perf_counter()
+    with open(report_path, 'w', encoding='utf-8', newline='') as report_file:
+        writer = csv.writer(report_file)
+        writer.writerow(['account_id', 'name', 'balance', 'expected_balance', 'difference', 'transactions'])
+
+        def report(account_id: int, name: str, balance: float, expected: float, count: int):
+            writer.writerow([account_id, name, f'{balance:.2f}', f'{expected:.2f}', f'{balance - expected:.2f}', count])
+
+        def progress(done: int, chunks: int, accounts: int, transactions: int, discrepancies: int):
+            click.echo(f"\r  tranche {done}/{chunks} - {accounts} compte(s), {transactions} transaction(s), "
+                       f"{discrepancies} écart(s) - {time.perf_counter() - started:.1f}s", nl=False, err=True)
+
+        result = reconcile_ledger(chunk_size, workers, report, progress)
+    elapsed = time.perf_counter() - started
+    click.echo(err=True)
+    click.echo(f"{result.accounts} compte(s) et {result.transactions} transaction(s) rapprochés en {elapsed:.1f}s "
+               f"({result.transactions / elapsed if elapsed else 0:,.0f} transactions/s).")
+    if result.unverified:
+        click.echo(f"{result.unverified} compte(s) sans point de contrôle d'ouverture, non vérifiable(s).")
+    if result.discrepancies:
+        click.echo(f"{result.discrepancies} écart(s) de solde, voir {report_path}.")
+        ctx.exit(1)
+    click.echo("Aucun écart de solde.")
+
+if app.config['GROUP_COMMIT']:
+    enable_group_commit(app.config['GROUP_COMMIT_MAX_BATCH'], app.config['GROUP_COMMIT_MAX_DELAY'])
+
+def main():
     with app.app_context():
-        db.create_all()
-    app.run(debug=True)
\ No newline at end of file
+        init_db()
+    app.run(debug=True)
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
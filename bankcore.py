@@ -0,0 +1,194 @@
+import argparse
+import datetime
+import importlib
+import os
+from typing import Dict, Sequence, Tuple
+
+from journal import BankStore, CREATE, DEPOSIT, FSYNC_BATCH, INTEREST, TRANSFER, WITHDRAW
+from ledger import ArrayLedger, ObjectLedger, format_transaction
+from locks import NoLocks, StripedLocks
+
+# Moteur bancaire partagé par les trois interfaces. Il ne dépend que de la bibliothèque
+# standard : ni Flask, ni SQLAlchemy, ni Tk ne sont chargés à l'import.
+
+DATA_DIR = os.environ.get('BANQUE_DATA_DIR', 'banque_data')
+JOURNAL_FSYNC = os.environ.get('BANQUE_JOURNAL_FSYNC', FSYNC_BATCH)
+
+DEPOSIT_TYPE = "Dépôt"
+WITHDRAWAL_TYPE = "Retrait"
+INTEREST_TYPE = "Intérêts"
+TRANSFER_TYPE = "Transfert"
+
+# Interfaces importées seulement à la demande : python bankcore.py cli|gui|web
+FRONTENDS = {'cli': 'banque', 'gui': 'banqueUI', 'web': 'app'}
+
+def monthly_interest(balance, interest_rate):
+    # Accepte aussi des colonnes SQLAlchemy : l'expression devient du SQL
+    return balance * (interest_rate / 12)
+
+def month_bounds(day: datetime.date) -> Tuple[datetime.date, datetime.date]:
+    month_start = day.replace(day=1)
+    return month_start, (month_start + datetime.timedelta(days=32)).replace(day=1)
+
+def is_interest_due(last_interest_date: datetime.date, today: datetime.date) -> bool:
+    # Les intérêts sont versés une fois par mois calendaire
+    return today.month != last_interest_date.month or today.year != last_interest_date.year
+
+class Transaction:
+    __slots__ = ('amount', 'type', 'description', 'date')
+
+    def __init__(self, amount: float, transaction_type: str, description: str = ""):
+        self.amount = amount
+        self.type = transaction_type
+        self.description = description
+        self.date = datetime.datetime.now()
+
+    def __str__(self):
+        return format_transaction(self.date, self.type, self.amount, self.description)
+
+class Account:
+    __slots__ = ('name', 'balance', 'interest_rate', 'pin', 'transactions', 'last_interest_date', 'bank')
+
+    def __init__(self, name: str, initial_balance: float, interest_rate: float, pin: str, compact_ledger: bool = False, bank: 'Bank' = None):
+        self.name = name
+        self.balance = initial_balance
+        self.interest_rate = interest_rate
+        self.pin = pin
+        # Historique compact (tableaux typés) ou liste d'objets Transaction
+        self.transactions = ArrayLedger() if compact_ledger else ObjectLedger(Transaction)
+        self.last_interest_date = datetime.date.today().replace(day=1)
+        # Compte isolé : ni journal ni verrous
+        self.bank = bank if bank is not None else STANDALONE_BANK
+
+    def deposit(self, amount: float, description: str = ""):
+        with self.bank.locks.hold(self.name):
+            date = datetime.datetime.now()
+            self._deposit(amount, description, date)
+            self.bank.record(DEPOSIT, date, self.name, amount, description)
+        self.bank.compact_if_due()
+
+    def withdraw(self, amount: float, description: str = "") -> bool:
+        with self.bank.locks.hold(self.name):
+            date = datetime.datetime.now()
+            if not self._withdraw(amount, description, date):
+                return False
+            self.bank.record(WITHDRAW, date, self.name, amount, description)
+        self.bank.compact_if_due()
+        return True
+
+    def _deposit(self, amount: float, description: str, date: datetime.datetime):
+        self.balance += amount
+        self.transactions.record(amount, DEPOSIT_TYPE, description, date)
+
+    def _withdraw(self, amount: float, description: str, date: datetime.datetime) -> bool:
+        if self.balance >= amount:
+            self.balance -= amount
+            self.transactions.record(amount, WITHDRAWAL_TYPE, description, date)
+            return True
+        return False
+
+    def get_balance(self) -> float:
+        return self.balance
+
+    def get_transactions(self) -> Sequence[Transaction]:
+        return self.transactions
+
+    def apply_monthly_interest(self):
+        today = datetime.date.today()
+        with self.bank.locks.hold(self.name):
+            if is_interest_due(self.last_interest_date, today):
+                interest = monthly_interest(self.balance, self.interest_rate)
+                date = datetime.datetime.now()
+                self._credit_interest(interest, today, date)
+                self.bank.record(INTEREST, date, self.name, interest, today.toordinal())
+        self.bank.compact_if_due()
+
+    def _credit_interest(self, interest: float, day: datetime.date, date: datetime.datetime):
+        self.balance += interest
+        self.transactions.record(interest, INTEREST_TYPE, "", date)
+        self.last_interest_date = day
+
+    def __str__(self):
+        return f"Compte {self.name}: Solde = {self.balance:.2f}€, Taux d'intérêt = {self.interest_rate*100:.2f}%"
+
+class Bank:
+    __slots__ = ('accounts', 'compact_ledger', 'store', 'locks')
+
+    def __init__(self, compact_ledger: bool = False, concurrent: bool = False):
+        self.accounts: Dict[str, Account] = {}
+        self.compact_ledger = compact_ledger
+        self.store = None
+        # Mode multi-thread : un verrou par bande de comptes plutôt qu'un verrou global
+        self.locks = StripedLocks() if concurrent else NoLocks()
+
+    @classmethod
+    def open(cls, directory: str = DATA_DIR, fsync: str = JOURNAL_FSYNC, compact_ledger: bool = True,
+             concurrent: bool = False) -> 'Bank':
+        # Banque persistante : instantané + journal rejoués depuis `directory`
+        bank = cls(compact_ledger, concurrent)
+        bank.store = BankStore(directory, fsync)
+        bank.store.load(bank)
+        return bank
+
+    def close(self):
+        if self.store is not None:
+            with self.locks.hold_all():
+                self.store.close(self)
+
+    def record(self, op: int, date: datetime.datetime, *fields):
+        if self.store is not None:
+            self.store.record(op, date, *fields)
+
+    def compact_if_due(self):
+        # Appelé hors de tout verrou : l'instantané fige toutes les bandes
+        if self.store is not None and self.store.snapshot_due:
+            with self.locks.hold_all():
+                if self.store.snapshot_due:
+                    self.store.snapshot(self)
+
+    def new_account(self, name: str, initial_balance: float, interest_rate: float, pin: str) -> Account:
+        return Account(name, initial_balance, interest_rate, pin, self.compact_ledger, self)
+
+    def create_account(self, name: str, initial_balance: float, interest_rate: float, pin: str) -> bool:
+        with self.locks.registry:
+            if name in self.accounts:
+                return False
+            self.accounts[name] = self.new_account(name, initial_balance, interest_rate, pin)
+            self.record(CREATE, datetime.datetime.now(), name, initial_balance, interest_rate, pin)
+        self.compact_if_due()
+        return True
+
+    def get_account(self, name: str, pin: str) -> Account:
+        account = self.accounts.get(name)
+        if account and account.pin == pin:
+            return account
+        return None
+
+    def transfer(self, from_account: Account, to_account: Account, amount: float) -> bool:
+        outgoing, incoming = f"Transfert vers {to_account.name}", f"Transfert de {from_account.name}"
+        with self.locks.hold(from_account.name, to_account.name):
+            date = datetime.datetime.now()
+            if not from_account._withdraw(amount, outgoing, date):
+                return False
+            to_account._deposit(amount, incoming, date)
+            self.record(TRANSFER, date, from_account.name, to_account.name, amount, outgoing, incoming)
+        self.compact_if_due()
+        return True
+
+    def apply_monthly_interest_all_accounts(self):
+        # Copie sous le verrou de registre : une création concurrente modifierait le dictionnaire
+        with self.locks.registry:
+            accounts = list(self.accounts.values())
+        for account in accounts:
+            account.apply_monthly_interest()
+
+STANDALONE_BANK = Bank()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gestionnaire de banque simplifié")
+    parser.add_argument('frontend', choices=sorted(FRONTENDS), help="interface à lancer")
+    args = parser.parse_args(argv)
+    importlib.import_module(FRONTENDS[args.frontend]).main()
+
+if __name__ == "__main__":
+    main()
@@ -1,80 +1,7 @@
-import datetime
-from typing import List, Dict
-
-class Transaction:
-    def __init__(self, amount: float, transaction_type: str):
-        self.amount = amount
-        self.type = transaction_type
-        self.date = datetime.datetime.now()
-
-    def __str__(self):
-        return f"{self.date.strftime('%Y-%m-%d %H:%M:%S')} - {self.type}: {self.amount:.2f}€"
-
-class Account:
-    def __init__(self, name: str, initial_balance: float, interest_rate: float, pin: str):
-        self.name = name
-        self.balance = initial_balance
-        self.interest_rate = interest_rate
-        self.pin = pin
-        self.transactions: List[Transaction] = []
-        self.last_interest_date = datetime.date.today().replace(day=1)
-
-    def deposit(self, amount: float):
-        self.balance += amount
-        self.transactions.append(Transaction(amount, "Dépôt"))
-
-    def withdraw(self, amount: float) -> bool:
-        if self.balance >= amount:
-            self.balance -= amount
-            self.transactions.append(Transaction(amount, "Retrait"))
-            return True
-        return False
-
-    def get_balance(self) -> float:
-        return self.balance
-
-    def get_transactions(self) -> List[Transaction]:
-        return self.transactions
-
-    def apply_monthly_interest(self):
-        today = datetime.date.today()
-        if today.month != self.last_interest_date.month or today.year != self.last_interest_date.year:
-            interest = self.balance * (self.interest_rate / 12)
-            self.balance += interest
-            self.transactions.append(Transaction(interest, "Intérêts"))
-            self.last_interest_date = today
-
-    def __str__(self):
-        return f"Compte {self.name}: Solde = {self.balance:.2f}€, Taux d'intérêt = {self.interest_rate*100:.2f}%"
-
-class Bank:
-    def __init__(self):
-        self.accounts: Dict[str, Account] = {}
-
-    def create_account(self, name: str, initial_balance: float, interest_rate: float, pin: str) -> bool:
-        if name not in self.accounts:
-            self.accounts[name] = Account(name, initial_balance, interest_rate, pin)
-            return True
-        return False
-
-    def get_account(self, name: str, pin: str) -> Account:
-        account = self.accounts.get(name)
-        if account and account.pin == pin:
-            return account
-        return None
-
-    def transfer(self, from_account: Account, to_account: Account, amount: float) -> bool:
-        if from_account.withdraw(amount):
-            to_account.deposit(amount)
-            return True
-        return False
-
-    def apply_monthly_interest_all_accounts(self):
-        for account in self.accounts.values():
-            account.apply_monthly_interest()
+from bankcore import Bank
 
 def main():
-    bank = Bank()
+    bank = Bank.open()
 
     while True:
         print("\n1. Créer un compte")
@@ -152,8 +79,10 @@ def main():
 
         elif choice == "4":
             print("Merci d'avoir utilisé notre service bancaire. Au revoir !")
+            bank.close()
             break
 
         bank.apply_monthly_interest_all_accounts()
 
-main()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
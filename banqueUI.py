@@ -1,90 +1,289 @@
 import datetime
-from typing import List, Dict
+import time
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
 from tkinter import ttk, messagebox, simpledialog
-
-class Transaction:
-    def __init__(self, amount: float, transaction_type: str, description: str = ""):
-        self.amount = amount
-        self.type = transaction_type
-        self.description = description
-        self.date = datetime.datetime.now()
-
-    def __str__(self):
-        if self.description:
-            return f"{self.date.strftime('%Y-%m-%d %H:%M:%S')} - {self.type}: {self.amount:.2f}€ - {self.description}"
-        return f"{self.date.strftime('%Y-%m-%d %H:%M:%S')} - {self.type}: {self.amount:.2f}€"
-
-class Account:
-    def __init__(self, name: str, initial_balance: float, interest_rate: float, pin: str):
-        self.name = name
-        self.balance = initial_balance
-        self.interest_rate = interest_rate
-        self.pin = pin
-        self.transactions: List[Transaction] = []
-        self.last_interest_date = datetime.date.today().replace(day=1)
-
-    def deposit(self, amount: float, description: str = ""):
-        self.balance += amount
-        self.transactions.append(Transaction(amount, "Dépôt", description))
-
-    def withdraw(self, amount: float, description: str = "") -> bool:
-        if self.balance >= amount:
-            self.balance -= amount
-            self.transactions.append(Transaction(amount, "Retrait", description))
-            return True
-        return False
-
-    def get_balance(self) -> float:
-        return self.balance
-
-    def get_transactions(self) -> List[Transaction]:
-        return self.transactions
-
-    def apply_monthly_interest(self):
-        today = datetime.date.today()
-        if today.month != self.last_interest_date.month or today.year != self.last_interest_date.year:
-            interest = self.balance * (self.interest_rate / 12)
-            self.balance += interest
-            self.transactions.append(Transaction(interest, "Intérêts"))
-            self.last_interest_date = today
-
-    def __str__(self):
-        return f"Compte {self.name}: Solde = {self.balance:.2f}€, Taux d'intérêt = {self.interest_rate*100:.2f}%"
-
-class Bank:
-    def __init__(self):
-        self.accounts: Dict[str, Account] = {}
-
-    def create_account(self, name: str, initial_balance: float, interest_rate: float, pin: str) -> bool:
-        if name not in self.accounts:
-            self.accounts[name] = Account(name, initial_balance, interest_rate, pin)
-            return True
-        return False
-
-    def get_account(self, name: str, pin: str) -> Account:
-        account = self.accounts.get(name)
-        if account and account.pin == pin:
-            return account
-        return None
-
-    def transfer(self, from_account: Account, to_account_name: str, amount: float) -> bool:
-        to_account = self.accounts.get(to_account_name)
-        if to_account:
-            if from_account.withdraw(amount, f"Transfert vers {to_account_name}"):
-                to_account.deposit(amount, f"Transfert de {from_account.name}")
-                return True
-        return False
-
-    def apply_monthly_interest_all_accounts(self):
-        for account in self.accounts.values():
-            account.apply_monthly_interest()
+from typing import Callable, Dict, Iterable, Optional, Sequence
+
+from bankcore import Bank, DEPOSIT_TYPE, INTEREST_TYPE, TRANSFER_TYPE, WITHDRAWAL_TYPE
+from ledger import TYPE_NAMES, ArrayLedger, to_timestamp
+
+VISIBLE_ROWS = 25
+POLL_INTERVAL_MS = 30
+ALL_TYPES = "Tous"
+NUMERIC_COLUMNS = ('amount', 'balance', 'interest_rate')
+
+class HistorySource:
+    # Historique d'un compte lu par indice. Avec un ArrayLedger, filtres et tris lisent
+    # directement les tableaux de dates, montants et types, sans objet par transaction.
+    columns = (('date', "Date", 150), ('type', "Type", 90), ('amount', "Montant", 100), ('description', "Description", 240))
+
+    def __init__(self, ledger):
+        self.ledger = ledger
+
+    def snapshot(self) -> int:
+        # Appelé dans la boucle Tk : les opérations ajoutées ensuite attendent la prochaine requête
+        return len(self.ledger)
+
+    def key(self, column: str) -> Callable[[int], object]:
+        ledger = self.ledger
+        if isinstance(ledger, ArrayLedger):
+            return {
+                'date': ledger.timestamps.__getitem__,
+                'type': lambda index: TYPE_NAMES[ledger.types[index]],
+                'amount': ledger.amounts.__getitem__,
+                'description': lambda index: ledger.descriptions.get(index, ""),
+            }[column]
+        return lambda index: getattr(ledger[index], column)
+
+    def date_bound(self, day: datetime.date):
+        moment = datetime.datetime.combine(day, datetime.time.min)
+        return to_timestamp(moment) if isinstance(self.ledger, ArrayLedger) else moment
+
+    def select(self, count: int, filters: Dict, sort_column: Optional[str], descending: bool) -> Sequence[int]:
+        # Thread de fond : renvoie les indices à afficher, du plus récent au plus ancien par défaut
+        indexes: Iterable[int] = range(count - 1, -1, -1)
+        if filters.get('type'):
+            type_of, wanted = self.key('type'), filters['type']
+            indexes = [index for index in indexes if type_of(index) == wanted]
+        if filters.get('start') or filters.get('end'):
+            date_of = self.key('date')
+            low = self.date_bound(filters['start']) if filters.get('start') else None
+            high = self.date_bound(filters['end'] + datetime.timedelta(days=1)) if filters.get('end') else None
+            indexes = [index for index in indexes
+                       if (low is None or date_of(index) >= low) and (high is None or date_of(index) < high)]
+        if sort_column:
+            indexes = sorted(indexes, key=self.key(sort_column), reverse=descending)
+        return indexes
+
+    def values(self, index: int) -> tuple:
+        entry = self.ledger[index]
+        return entry.date.strftime('%Y-%m-%d %H:%M:%S'), entry.type, f"{entry.amount:.2f}€", entry.description
+
+class AccountsSource:
+    columns = (('name', "Nom", 200), ('balance', "Solde", 120), ('interest_rate', "Taux d'intérêt", 110))
+
+    def __init__(self, bank: Bank):
+        self.bank = bank
+
+    def snapshot(self) -> list:
+        return list(self.bank.accounts.values())
+
+    def select(self, accounts: list, filters: Dict, sort_column: Optional[str], descending: bool) -> Sequence:
+        text = filters.get('name', '').casefold()
+        if text:
+            accounts = [account for account in accounts if text in account.name.casefold()]
+        if sort_column:
+            accounts = sorted(accounts, key=attrgetter(sort_column), reverse=descending)
+        return accounts
+
+    def values(self, account) -> tuple:
+        return account.name, f"{account.balance:.2f}€", f"{account.interest_rate * 100:.2f}%"
+
+class VirtualTable(ttk.Frame):
+    # Tableau virtualisé : le Treeview ne contient que les lignes visibles, remplies à chaque
+    # défilement à partir de la sélection courante (indices ou comptes). Filtres et tris
+    # tournent dans un thread de fond ; la boucle Tk se contente de relever le résultat.
+    def __init__(self, master, source, rows: int = VISIBLE_ROWS):
+        super().__init__(master)
+        self.source = source
+        self.rows = rows
+        self.items: Sequence = ()
+        self.offset = 0
+        self.filters: Dict = {}
+        self.sort_column: Optional[str] = None
+        self.descending = False
+        self.generation = 0
+        self.pending = None
+        self.poll_id = None
+        self.started = 0.0
+        # Un seul thread : une demande dépassée par une plus récente est abandonnée sans calcul
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+        self.tree = ttk.Treeview(self, columns=[name for name, _, _ in source.columns], show='headings',
+                                 height=rows, selectmode='browse')
+        for name, title, width in source.columns:
+            self.tree.heading(name, text=title, command=lambda name=name: self.sort(name))
+            self.tree.column(name, width=width, anchor='e' if name in NUMERIC_COLUMNS else 'w')
+        self.scrollbar = ttk.Scrollbar(self, orient='vertical', command=self.on_scrollbar)
+        self.status = ttk.Label(self, text="")
+        self.tree.grid(row=0, column=0, sticky='nsew')
+        self.scrollbar.grid(row=0, column=1, sticky='ns')
+        self.status.grid(row=1, column=0, columnspan=2, sticky='w', pady=(3, 0))
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+
+        self.tree.bind('<MouseWheel>', self.on_wheel)
+        self.tree.bind('<Button-4>', self.on_wheel)
+        self.tree.bind('<Button-5>', self.on_wheel)
+        self.tree.bind('<Up>', lambda event: self.on_arrow(-1))
+        self.tree.bind('<Down>', lambda event: self.on_arrow(1))
+        self.tree.bind('<Prior>', lambda event: self.on_page(self.offset - rows))
+        self.tree.bind('<Next>', lambda event: self.on_page(self.offset + rows))
+        self.tree.bind('<Home>', lambda event: self.on_page(0))
+        self.tree.bind('<End>', lambda event: self.on_page(len(self.items)))
+
+    def query(self, filters: Optional[Dict] = None):
+        if filters is not None:
+            self.filters = filters
+        self.generation += 1
+        generation = self.generation
+        arguments = (self.source.snapshot(), dict(self.filters), self.sort_column, self.descending)
+        self.pending = self.executor.submit(self.select, generation, *arguments)
+        self.started = time.perf_counter()
+        self.status.config(text="Chargement…")
+        if self.poll_id is None:
+            self.poll_id = self.after(POLL_INTERVAL_MS, self.poll)
+
+    def select(self, generation: int, *arguments):
+        if generation != self.generation:
+            return None
+        return self.source.select(*arguments)
+
+    def poll(self):
+        if not self.pending.done():
+            self.poll_id = self.after(POLL_INTERVAL_MS, self.poll)
+            return
+        self.poll_id = None
+        future, self.pending = self.pending, None
+        try:
+            self.items = future.result()
+        except Exception as exc:
+            self.status.config(text=f"Erreur : {exc}")
+            return
+        self.offset = 0
+        self.render()
+        self.status.config(text=f"{len(self.items):,} ligne(s) en {time.perf_counter() - self.started:.2f}s".replace(',', ' '))
+
+    def sort(self, column: str):
+        self.descending = not self.descending if column == self.sort_column else False
+        self.sort_column = column
+        for name, title, _ in self.source.columns:
+            arrow = (" ▼" if self.descending else " ▲") if name == column else ""
+            self.tree.heading(name, text=title + arrow)
+        self.query()
+
+    def render(self):
+        # Réutilise les lignes existantes du Treeview : seules leurs valeurs changent
+        window = self.items[self.offset:self.offset + self.rows]
+        children = self.tree.get_children()
+        for row, item in enumerate(window):
+            values = self.source.values(item)
+            if row < len(children):
+                self.tree.item(children[row], values=values)
+            else:
+                self.tree.insert('', 'end', values=values)
+        if len(children) > len(window):
+            self.tree.delete(*children[len(window):])
+        total = len(self.items)
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + self.rows) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def scroll_to(self, offset: int):
+        offset = max(0, min(offset, len(self.items) - self.rows))
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+
+    def on_scrollbar(self, action: str, amount: str, unit: str = None):
+        if action == 'moveto':
+            self.scroll_to(int(float(amount) * len(self.items)))
+        elif action == 'scroll':
+            self.scroll_to(self.offset + int(amount) * (self.rows if unit == 'pages' else 1))
+
+    def on_arrow(self, step: int):
+        # Les flèches déplacent la sélection ; au bord de la fenêtre visible, c'est elle qui défile
+        children = self.tree.get_children()
+        selection = self.tree.selection()
+        if children and selection and selection[0] != (children[0] if step < 0 else children[-1]):
+            return None
+        self.scroll_to(self.offset + step)
+        return 'break'
+
+    def on_page(self, offset: int):
+        self.scroll_to(offset)
+        return 'break'
+
+    def on_wheel(self, event):
+        up = event.num == 4 or event.delta > 0
+        self.scroll_to(self.offset + (-3 if up else 3))
+        return 'break'
+
+    def destroy(self):
+        if self.poll_id is not None:
+            self.after_cancel(self.poll_id)
+            self.poll_id = None
+        # Les demandes plus anciennes encore en file ressortent aussitôt (génération dépassée)
+        self.generation += 1
+        if self.pending is not None:
+            self.pending.cancel()
+            self.pending = None
+        self.executor.shutdown(wait=False)
+        super().destroy()
+
+def parse_day(text: str) -> Optional[datetime.date]:
+    text = text.strip()
+    return datetime.date.fromisoformat(text) if text else None
+
+class HistoryWindow(tk.Toplevel):
+    def __init__(self, master, account):
+        super().__init__(master)
+        self.title(f"Historique des transactions - {account.name}")
+        bar = ttk.Frame(self)
+        bar.pack(fill='x', padx=5, pady=5)
+        self.type_var = tk.StringVar(value=ALL_TYPES)
+        self.start_var = tk.StringVar()
+        self.end_var = tk.StringVar()
+        ttk.Label(bar, text="Type :").pack(side='left')
+        ttk.Combobox(bar, textvariable=self.type_var, state='readonly', width=10,
+                     values=(ALL_TYPES, DEPOSIT_TYPE, WITHDRAWAL_TYPE, INTEREST_TYPE, TRANSFER_TYPE)).pack(side='left')
+        ttk.Label(bar, text="Du (AAAA-MM-JJ) :").pack(side='left', padx=(10, 0))
+        ttk.Entry(bar, textvariable=self.start_var, width=11).pack(side='left')
+        ttk.Label(bar, text="au :").pack(side='left', padx=(5, 0))
+        ttk.Entry(bar, textvariable=self.end_var, width=11).pack(side='left')
+        ttk.Button(bar, text="Filtrer / Actualiser", command=self.apply_filters).pack(side='left', padx=10)
+
+        self.table = VirtualTable(self, HistorySource(account.get_transactions()))
+        self.table.pack(expand=True, fill='both', padx=5, pady=(0, 5))
+        self.bind('<Return>', lambda event: self.apply_filters())
+        self.table.query()
+
+    def apply_filters(self):
+        try:
+            start, end = parse_day(self.start_var.get()), parse_day(self.end_var.get())
+        except ValueError:
+            messagebox.showerror("Erreur", "Date invalide, format attendu : AAAA-MM-JJ.", parent=self)
+            return
+        transaction_type = self.type_var.get()
+        self.table.query({'type': None if transaction_type == ALL_TYPES else transaction_type, 'start': start, 'end': end})
+
+class AccountsWindow(tk.Toplevel):
+    def __init__(self, master, bank: Bank):
+        super().__init__(master)
+        self.title("Tous les comptes")
+        bar = ttk.Frame(self)
+        bar.pack(fill='x', padx=5, pady=5)
+        self.name_var = tk.StringVar()
+        ttk.Label(bar, text="Nom contient :").pack(side='left')
+        ttk.Entry(bar, textvariable=self.name_var, width=20).pack(side='left')
+        ttk.Button(bar, text="Filtrer / Actualiser", command=self.apply_filters).pack(side='left', padx=10)
+
+        self.table = VirtualTable(self, AccountsSource(bank))
+        self.table.pack(expand=True, fill='both', padx=5, pady=(0, 5))
+        self.bind('<Return>', lambda event: self.apply_filters())
+        self.table.query()
+
+    def apply_filters(self):
+        self.table.query({'name': self.name_var.get().strip()})
 
 class BankGUI:
     def __init__(self, master):
         self.master = master
         self.master.title("Gestionnaire de Banque")
-        self.bank = Bank()
+        self.bank = Bank.open()
         self.current_account = None
 
         self.create_widgets()
@@ -104,7 +303,8 @@ class BankGUI:
         ttk.Button(self.main_frame, text="Créer un compte", command=self.create_account).pack(pady=10)
         ttk.Button(self.main_frame, text="Accéder à un compte", command=self.access_account).pack(pady=10)
         ttk.Button(self.main_frame, text="Afficher tous les comptes", command=self.display_all_accounts).pack(pady=10)
-        ttk.Button(self.main_frame, text="Quitter", command=self.master.quit).pack(pady=10)
+        ttk.Button(self.main_frame, text="Quitter", command=self.quit).pack(pady=10)
+        self.master.protocol("WM_DELETE_WINDOW", self.quit)
 
         # Account Frame
         self.welcome_label = ttk.Label(self.account_frame, text="", font=("Arial", 14, "bold"))
@@ -145,8 +345,7 @@ class BankGUI:
                 messagebox.showerror("Erreur", "Compte non trouvé ou PIN incorrect.")
 
     def display_all_accounts(self):
-        accounts_info = "\n".join(str(account) for account in self.bank.accounts.values())
-        messagebox.showinfo("Tous les comptes", accounts_info)
+        AccountsWindow(self.master, self.bank)
 
     def deposit(self):
         amount = simpledialog.askfloat("Dépôt", "Montant à déposer:")
@@ -165,8 +364,7 @@ class BankGUI:
                 messagebox.showerror("Erreur", "Solde insuffisant.")
 
     def display_history(self):
-        history = "\n".join(str(transaction) for transaction in self.current_account.get_transactions())
-        messagebox.showinfo("Historique des transactions", history)
+        HistoryWindow(self.master, self.current_account)
 
     def transfer(self):
         to_account_name = simpledialog.askstring("Transfert", "Nom du compte destinataire:")
@@ -175,7 +373,8 @@ class BankGUI:
             if amount:
                 pin = self.ask_pin("Transfert", "Veuillez entrer votre code PIN pour confirmer le transfert:")
                 if pin == self.current_account.pin:
-                    if self.bank.transfer(self.current_account, to_account_name, amount):
+                    to_account = self.bank.accounts.get(to_account_name)
+                    if to_account and self.bank.transfer(self.current_account, to_account, amount):
                         self.update_balance_label()
                         messagebox.showinfo("Succès", f"Transfert de {amount:.2f}€ effectué vers {to_account_name}.")
                     else:
@@ -213,9 +412,17 @@ class BankGUI:
         self.master.wait_window(dialog)
         return pin
 
+    def quit(self):
+        self.bank.close()
+        self.master.quit()
+
     def run(self):
         self.master.mainloop()
 
-root = tk.Tk()
-app = BankGUI(root)
-app.run()
\ No newline at end of file
+def main():
+    root = tk.Tk()
+    app = BankGUI(root)
+    app.run()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Import de comptes en masse : `flask import-accounts` contre le formulaire /create_account.
+
+Un fichier CSV de comptes (avec 1 % de doublons) est généré puis importé par tranches ;
+le pic de mémoire Python (tracemalloc) doit rester stable quand la taille du fichier grandit.
+
+    python benchmarks/bench_account_loader.py --sizes 10000 100000 500000 --form-accounts 500
+"""
+import argparse
+import csv
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+
+from common import load_app, temp_db_path
+
+
+def write_accounts(path: str, count: int, prefix: str):
+    with open(path, 'w', encoding='utf-8', newline='') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(['name', 'initial_balance', 'interest_rate', 'pin'])
+        for i in range(count):
+            # Une ligne sur cent reprend un nom déjà vu : elle doit être rejetée
+            writer.writerow([f'{prefix}{i - 1 if i % 100 == 99 else i}', 100 + i % 900, 0.02, f'{i % 10000:04d}'])
+
+
+def run_loader(banque, path: str) -> tuple:
+    rejected_rows = io.StringIO()
+    writer = csv.writer(rejected_rows)
+    tracemalloc.start()
+    started = time.perf_counter()
+    with banque.app.app_context(), open(path, encoding='utf-8') as source:
+        inserted, rejected = banque.import_accounts(
+            banque.read_account_records(source, 'csv'),
+            lambda line_number, record, reason: writer.writerow([line_number, reason]),
+        )
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return inserted, rejected, elapsed, peak
+
+
+def run_form(banque, count: int) -> float:
+    client = banque.app.test_client()
+    started = time.perf_counter()
+    for i in range(count):
+        client.post('/create_account', data={
+            'name': f'formulaire{i}', 'initial_balance': 100, 'interest_rate': 0.02, 'pin': '0000',
+        })
+    return count / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 500_000])
+    parser.add_argument('--form-accounts', type=int, default=500)
+    args = parser.parse_args()
+
+    banque = load_app(temp_db_path())
+    directory = tempfile.mkdtemp(prefix='banque-import-')
+    print(f"{'lignes':>10} {'importés':>10} {'rejets':>8} {'comptes/s':>11} {'pic mémoire':>12}")
+    for run, size in enumerate(args.sizes):
+        path = os.path.join(directory, f'comptes-{size}.csv')
+        write_accounts(path, size, f'import{run}-')
+        inserted, rejected, elapsed, peak = run_loader(banque, path)
+        print(f"{size:>10} {inserted:>10} {rejected:>8} {inserted / elapsed:>11,.0f} {peak / 2**20:>9.1f} Mo")
+        os.remove(path)
+    if args.form_accounts:
+        print(f"formulaire /create_account : {run_form(banque, args.form_accounts):,.0f} comptes/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""Bank en mémoire piloté par un pool de threads : transferts aléatoires par lots.
+
+Chaque tâche soumise au ThreadPoolExecutor enchaîne un lot de transferts entre comptes
+tirés au hasard. Pendant l'exécution, le thread principal fige toutes les bandes de
+verrous pour vérifier que la somme des soldes ne varie pas ; à la fin, la somme, les
+soldes (jamais négatifs) et, avec --journal, la banque rechargée depuis le disque sont
+contrôlés. Le même scénario est mesuré avec des verrous répartis et un verrou global.
+
+    python benchmarks/bench_concurrent_bank.py --threads 8 --batches 400 --batch-size 500
+"""
+import argparse
+import random
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from common import ROOT
+
+sys.path.insert(0, ROOT)
+import bankcore  # noqa: E402
+from journal import FSYNC_OFF  # noqa: E402
+from locks import DEFAULT_STRIPES, StripedLocks  # noqa: E402
+
+INITIAL_BALANCE = 100
+
+
+def transfer_batch(bank: bankcore.Bank, names, seed: int, size: int) -> int:
+    rng = random.Random(seed)
+    done = 0
+    for _ in range(size):
+        source, target = rng.sample(names, 2)
+        # Montants entiers : la somme des soldes reste exacte en flottant
+        if bank.transfer(bank.accounts[source], bank.accounts[target], rng.randint(1, 40)):
+            done += 1
+    return done
+
+
+def total(bank: bankcore.Bank) -> float:
+    with bank.locks.hold_all():
+        return sum(account.balance for account in bank.accounts.values())
+
+
+def run(args, stripes: int) -> list:
+    directory = tempfile.mkdtemp(prefix='banque-concurrent-') if args.journal else None
+    try:
+        if directory:
+            bank = bankcore.Bank.open(directory, FSYNC_OFF, concurrent=True)
+            bank.store.snapshot_every = args.snapshot_every
+        else:
+            bank = bankcore.Bank(compact_ledger=True, concurrent=True)
+        bank.locks = StripedLocks(stripes)
+        with ThreadPoolExecutor(args.threads) as pool:
+            list(pool.map(lambda i: bank.create_account(f'client{i}', INITIAL_BALANCE, 0.02, '0000'),
+                          range(args.accounts)))
+        names = list(bank.accounts)
+        expected = INITIAL_BALANCE * args.accounts
+        failures = []
+        if len(names) != args.accounts:
+            failures.append(f"{len(names)} comptes créés au lieu de {args.accounts}")
+
+        audits = 0
+        started = time.perf_counter()
+        with ThreadPoolExecutor(args.threads) as pool:
+            futures = [pool.submit(transfer_batch, bank, names, seed, args.batch_size)
+                       for seed in range(args.batches)]
+            while not all(future.done() for future in futures):
+                audits += 1
+                if total(bank) != expected:
+                    failures.append(f"somme incohérente pendant l'exécution : {total(bank)}")
+                    break
+                wait(futures, timeout=0.01)
+            transfers = sum(future.result() for future in futures)
+        elapsed = time.perf_counter() - started
+
+        if total(bank) != expected:
+            failures.append(f"somme finale {total(bank)} au lieu de {expected}")
+        negative = [account.name for account in bank.accounts.values() if account.balance < 0]
+        if negative:
+            failures.append(f"soldes négatifs : {negative[:5]}")
+        if directory:
+            balances = {name: account.balance for name, account in bank.accounts.items()}
+            bank.store.journal.close()
+            reloaded = bankcore.Bank.open(directory, FSYNC_OFF)
+            if {name: account.balance for name, account in reloaded.accounts.items()} != balances:
+                failures.append("la banque rechargée depuis le journal diffère")
+            reloaded.store.journal.close()
+
+        attempts = args.batches * args.batch_size
+        print(f"{stripes:>7} {attempts / elapsed:>14,.0f} {transfers:>11} {audits:>8}")
+        return failures
+    finally:
+        if directory:
+            shutil.rmtree(directory)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--accounts', type=int, default=1000)
+    parser.add_argument('--batches', type=int, default=400)
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--journal', action='store_true', help="journalise sur disque et recharge à la fin")
+    parser.add_argument('--snapshot-every', type=int, default=50_000)
+    args = parser.parse_args()
+
+    print(f"{'bandes':>7} {'transferts/s':>14} {'réussis':>11} {'contrôles':>8}")
+    failures = []
+    for stripes in (DEFAULT_STRIPES, 1):
+        failures += run(args, stripes)
+    for failure in failures:
+        print("ÉCHEC :", failure)
+    if failures:
+        sys.exit(1)
+    print(f"OK : {INITIAL_BALANCE * args.accounts}€ au total, conservés")
+
+
+if __name__ == '__main__':
+    main()
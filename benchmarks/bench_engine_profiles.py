@@ -0,0 +1,92 @@
+"""Réglages du moteur SQLite : débit de plusieurs processus WSGI concurrents selon le profil.
+
+    python benchmarks/bench_engine_profiles.py --processes 4 --workers 4 --duration 10
+
+Chaque profil lance `--processes` exemplaires de load.py sur la même base, comme autant de
+workers WSGI, et additionne leurs rapports. Le profil « rollback » reproduit l'ancien réglage
+(journal de rollback, synchronous FULL).
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from common import connect, load_app, seed_accounts, seed_history, temp_db_path
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PROFILES = {
+    'rollback': {'BANQUE_SQLITE_JOURNAL_MODE': 'DELETE'},
+    'wal': {},
+    'wal+normal': {'BANQUE_SQLITE_SYNCHRONOUS': 'NORMAL', 'BANQUE_SQLITE_MMAP_SIZE': '268435456',
+                   'BANQUE_SQLITE_CACHE_SIZE': '-65536'},
+    'wal+normal+lecture': {'BANQUE_SQLITE_SYNCHRONOUS': 'NORMAL', 'BANQUE_SQLITE_MMAP_SIZE': '268435456',
+                           'BANQUE_SQLITE_CACHE_SIZE': '-65536', 'BANQUE_READ_ENGINE': '1'},
+}
+
+
+def run_profile(db_path: str, environment, args) -> dict:
+    # Le mode de journal se change hors de toute connexion ouverte, avant de lancer les processus
+    conn = connect(db_path)
+    conn.execute(f"PRAGMA journal_mode = {environment.get('BANQUE_SQLITE_JOURNAL_MODE', 'WAL')}")
+    conn.close()
+    environment = dict(environment, BANQUE_POOL_SIZE=str(args.workers))
+    outputs = [tempfile.mktemp(suffix='.json') for _ in range(args.processes)]
+    processes = [
+        subprocess.Popen(
+            [sys.executable, os.path.join(HERE, 'load.py'), '--db', db_path, '--workers', str(args.workers),
+             '--duration', str(args.duration), '--seed', str(index), '--output', output]
+            + [f'--env={key}={value}' for key, value in environment.items()],
+            cwd=HERE, stdout=subprocess.DEVNULL,
+        )
+        for index, output in enumerate(outputs)
+    ]
+    for process in processes:
+        process.wait()
+    reports = []
+    for output in outputs:
+        with open(output, encoding='utf-8') as handle:
+            reports.append(json.load(handle))
+        os.remove(output)
+
+    def route_p99(route: str) -> float:
+        return max(report['routes'].get(route, {}).get('p99_ms', 0.0) for report in reports)
+    return {
+        'throughput': sum(report['throughput_rps'] for report in reports),
+        'errors': sum(route['errors'] for report in reports for route in report['routes'].values()),
+        'account_p99': route_p99('/account'),
+        'deposit_p99': route_p99('/deposit'),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--workers', type=int, default=4, help="threads par processus")
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--accounts', type=int, default=1000)
+    parser.add_argument('--transactions', type=int, default=100)
+    parser.add_argument('--profiles', nargs='+', default=list(PROFILES), choices=list(PROFILES))
+    args = parser.parse_args()
+
+    db_path = temp_db_path()
+    banque = load_app(db_path)
+    conn = connect(db_path)
+    first_id, last_id = seed_accounts(conn, args.accounts, balance=10_000.0)
+    seed_history(conn, first_id, last_id, args.transactions)
+    conn.close()
+    with banque.app.app_context():
+        banque.db.engine.dispose()
+
+    print(f"{args.processes} processus × {args.workers} threads, {args.duration:.0f}s par profil")
+    print(f"{'profil':<20} {'requêtes/s':>11} {'erreurs':>8} {'p99 /account':>13} {'p99 /deposit':>13}")
+    for name in args.profiles:
+        result = run_profile(db_path, PROFILES[name], args)
+        print(f"{name:<20} {result['throughput']:>11,.0f} {result['errors']:>8} "
+              f"{result['account_p99']:>10.1f} ms {result['deposit_p99']:>10.1f} ms")
+    print(f"(base : {db_path})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""Débit d'écriture : un commit par opération contre l'écriture groupée.
+
+    python benchmarks/bench_group_commit.py --threads 16 --postings 200
+"""
+import argparse
+import random
+import threading
+import time
+
+from common import connect, load_app, seed_accounts, temp_db_path
+
+
+def run(banque, threads: int, postings: int, accounts: int) -> tuple:
+    errors = []
+
+    def worker(seed: int):
+        rng = random.Random(seed)
+        with banque.app.app_context():
+            for _ in range(postings):
+                account = banque.db.session.get(banque.Account, rng.randint(1, accounts))
+                try:
+                    choice = rng.random()
+                    if choice < 0.5:
+                        account.deposit(10.0)
+                    elif choice < 0.8:
+                        account.withdraw(5.0)
+                    else:
+                        to_account = banque.db.session.get(banque.Account, rng.randint(1, accounts))
+                        account.transfer(to_account, 1.0)
+                except Exception as exc:  # "database is locked" en mode commit par opération
+                    banque.db.session.rollback()
+                    errors.append(exc)
+
+    pool = [threading.Thread(target=worker, args=(seed,)) for seed in range(threads)]
+    started = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return (threads * postings - len(errors)) / elapsed, len(errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--postings', type=int, default=200, help="opérations par thread")
+    parser.add_argument('--accounts', type=int, default=1000)
+    parser.add_argument('--max-batch', type=int, default=256)
+    parser.add_argument('--max-delay', type=float, default=0.002)
+    args = parser.parse_args()
+
+    db_path = temp_db_path()
+    banque = load_app(db_path)
+    conn = connect(db_path)
+    seed_accounts(conn, args.accounts)
+    conn.close()
+
+    rate, errors = run(banque, args.threads, args.postings, args.accounts)
+    print(f"commit par opération : {rate:,.0f} opérations/s ({errors} erreur(s))")
+
+    banque.enable_group_commit(args.max_batch, args.max_delay)
+    rate, errors = run(banque, args.threads, args.postings, args.accounts)
+    writer = banque.posting_writer
+    print(f"écriture groupée     : {rate:,.0f} opérations/s ({errors} erreur(s), "
+          f"{writer.operations / max(writer.batches, 1):.1f} opérations par commit)")
+    banque.disable_group_commit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""Latence de /history paginé par curseur en fonction de la taille de l'historique.
+
+    python benchmarks/bench_history.py --sizes 10000 100000 1000000
+"""
+import argparse
+import datetime
+
+from common import connect, load_app, seed_accounts, seed_transactions, temp_db_path, timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--page-size', type=int, default=50)
+    parser.add_argument('--full-load-limit', type=int, default=100_000,
+                        help="taille maximale pour mesurer l'ancien chargement complet")
+    args = parser.parse_args()
+
+    db_path = temp_db_path()
+    banque = load_app(db_path)
+    conn = connect(db_path)
+    account_id, _ = seed_accounts(conn, 1)
+    # Un second compte actif pour que l'index ait à discriminer entre comptes
+    noise_id, _ = seed_accounts(conn, 1, name_prefix='bruit')
+
+    print(f"{'transactions':>12} {'1re page':>10} {'page milieu':>12} {'dernière':>10} {'filtre date':>12} {'tout charger':>13}")
+    seeded = 0
+    for size in sorted(args.sizes):
+        seed_transactions(conn, account_id, size - seeded)
+        seed_transactions(conn, noise_id, size - seeded)
+        seeded = size
+        conn.execute('ANALYZE')
+        conn.commit()
+
+        with banque.app.app_context():
+            account = banque.db.session.get(banque.Account, account_id)
+            Transaction = banque.Transaction
+            ordered = Transaction.query.filter_by(account_id=account_id).order_by(
+                Transaction.date.desc(), Transaction.id.desc())
+            middle = banque.encode_cursor(ordered.offset(size // 2).first())
+            last = banque.encode_cursor(ordered.offset(size - args.page_size - 1).first())
+            first_date = ordered.offset(size // 2).first().date.date()
+
+            def page(**kwargs):
+                account.get_transactions_page(limit=args.page_size, **kwargs)
+
+            first_ms = timed(lambda: page())
+            middle_ms = timed(lambda: page(next_cursor=middle))
+            last_ms = timed(lambda: page(next_cursor=last))
+            filtered_ms = timed(lambda: page(start=first_date, end=first_date + datetime.timedelta(days=7)))
+            full_ms = '-'
+            if size <= args.full_load_limit:
+                def full_load():
+                    banque.db.session.expire_all()
+                    len(banque.db.session.get(banque.Account, account_id).get_transactions())
+                full_ms = f'{timed(full_load, repeat=1):.1f}'
+
+        print(f'{size:>12} {first_ms:>10.2f} {middle_ms:>12.2f} {last_ms:>10.2f} {filtered_ms:>12.2f} {full_ms:>13}')
+    print(f"(temps en ms, meilleur de 5 ; base : {db_path})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""Historique du client Tk : navigateur virtualisé contre la boîte de dialogue qui joignait tout l'historique.
+
+    python benchmarks/bench_history_browser.py --postings 1000000
+
+Les filtres et tris sont mesurés sans affichage. Avec un écran (DISPLAY), le script mesure
+aussi le plus long blocage de la boucle Tk pendant un tri en arrière-plan.
+"""
+import argparse
+import datetime
+import os
+import sys
+import time
+
+from common import ROOT
+
+sys.path.insert(0, ROOT)
+
+from bankcore import Bank, TRANSFER_TYPE, WITHDRAWAL_TYPE  # noqa: E402
+from banqueUI import VISIBLE_ROWS, HistorySource  # noqa: E402
+
+TYPES = ("Dépôt", WITHDRAWAL_TYPE, "Intérêts", TRANSFER_TYPE)
+
+
+def build_account(postings: int):
+    bank = Bank(compact_ledger=True)
+    bank.create_account('client', 0.0, 0.02, '0000')
+    account = bank.accounts['client']
+    start = datetime.datetime(2015, 1, 1)
+    for i in range(postings):
+        account.transactions.record(10.0 + i % 90, TYPES[i % 4], "", start + datetime.timedelta(minutes=7 * i))
+    return account
+
+
+def measure_main_loop(source):
+    # Plus long intervalle entre deux ticks de 10 ms pendant un tri par montant en arrière-plan
+    import tkinter as tk
+    from banqueUI import VirtualTable
+
+    root = tk.Tk()
+    table = VirtualTable(root, source)
+    table.pack()
+    gaps = []
+    last = [time.perf_counter()]
+
+    def tick():
+        now = time.perf_counter()
+        gaps.append(now - last[0])
+        last[0] = now
+        if table.pending is None and len(gaps) > 5:
+            root.quit()
+        else:
+            root.after(10, tick)
+
+    table.sort('amount')
+    root.after(10, tick)
+    root.mainloop()
+    root.destroy()
+    return max(gaps) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--postings', type=int, default=1_000_000)
+    parser.add_argument('--dialog-postings', type=int, default=100_000,
+                        help="taille maximale pour mesurer l'ancienne construction de la chaîne complète")
+    args = parser.parse_args()
+
+    account = build_account(args.postings)
+    source = HistorySource(account.get_transactions())
+    count = source.snapshot()
+    middle = datetime.date(2015, 1, 1) + datetime.timedelta(minutes=7 * count // 2)
+    cases = [
+        ("défaut (plus récent d'abord)", {}, None, False),
+        ("filtre type", {'type': WITHDRAWAL_TYPE}, None, False),
+        ("filtre 30 jours", {'start': middle, 'end': middle + datetime.timedelta(days=29)}, None, False),
+        ("tri par montant", {}, 'amount', True),
+        ("filtre type + tri date", {'type': TRANSFER_TYPE}, 'date', False),
+    ]
+    print(f"{count:,} transactions")
+    for label, filters, column, descending in cases:
+        started = time.perf_counter()
+        items = source.select(count, filters, column, descending)
+        selected = time.perf_counter() - started
+        started = time.perf_counter()
+        for item in items[len(items) // 2:len(items) // 2 + VISIBLE_ROWS]:
+            source.values(item)
+        window = time.perf_counter() - started
+        print(f"  {label:<30} {len(items):>9,} lignes  sélection {selected * 1000:8.1f} ms  "
+              f"fenêtre de {VISIBLE_ROWS} lignes {window * 1000:.2f} ms")
+
+    sample = min(count, args.dialog_postings)
+    started = time.perf_counter()
+    "\n".join(str(account.transactions[index]) for index in range(sample))
+    joined = time.perf_counter() - started
+    print(f"  ancienne boîte de dialogue : {joined:.2f}s pour {sample:,} transactions "
+          f"(≈ {joined * count / sample:.1f}s pour tout l'historique, bloquant la boucle Tk)")
+
+    if os.environ.get('DISPLAY'):
+        print(f"  boucle Tk pendant un tri : blocage maximal {measure_main_loop(source):.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
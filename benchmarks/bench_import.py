@@ -0,0 +1,59 @@
+"""Coût de démarrage à froid : importer le moteur seul contre les interfaces.
+
+Chaque import est mesuré dans un interpréteur neuf, hors démarrage de Python. Le script
+vérifie aussi qu'importer `bankcore` ne charge ni Flask, ni SQLAlchemy, ni Tk.
+
+    python benchmarks/bench_import.py --repeat 10
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+from common import ROOT, temp_db_path
+
+MODULES = ['bankcore', 'banque', 'banqueUI', 'app']
+HEAVY = ['flask', 'flask_sqlalchemy', 'sqlalchemy', 'tkinter']
+PROBE = """
+import sys, time
+started = time.perf_counter()
+{statement}
+print(time.perf_counter() - started)
+print(','.join(name for name in {heavy!r} if name in sys.modules))
+"""
+
+
+def measure(statement: str, env: dict) -> tuple:
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE.format(statement=statement, heavy=HEAVY)],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    ).stdout.splitlines()
+    return float(output[0]), output[1] if len(output) > 1 else ''
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    # app.py crée son moteur à l'import : on le dirige vers une base jetable
+    env = dict(os.environ, BANQUE_DATABASE_URI='sqlite:///' + temp_db_path())
+    failures = []
+    print(f"{'module':>10} {'médiane':>10} {'min':>10}  modules lourds chargés")
+    for module in MODULES:
+        samples, loaded = [], ''
+        for _ in range(args.repeat):
+            elapsed, loaded = measure(f'import {module}', env)
+            samples.append(elapsed)
+        print(f"{module:>10} {statistics.median(samples) * 1000:>7.1f} ms {min(samples) * 1000:>7.1f} ms  {loaded or '-'}")
+        if module == 'bankcore' and loaded:
+            failures.append(f"bankcore charge {loaded}")
+    for failure in failures:
+        print("ÉCHEC :", failure)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Intérêts mensuels : moteur ensembliste par tranches contre l'ancien chemin compte par compte.
+
+    python benchmarks/bench_interest.py --accounts 1000000 --legacy-accounts 2000
+"""
+import argparse
+import datetime
+import time
+
+from common import connect, load_app, seed_accounts, temp_db_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--accounts', type=int, default=1_000_000)
+    parser.add_argument('--legacy-accounts', type=int, default=2_000,
+                        help="comptes traités par l'ancien chemin (extrapolé ensuite)")
+    parser.add_argument('--chunk-size', type=int, default=10_000)
+    args = parser.parse_args()
+
+    last_month = (datetime.date.today().replace(day=1) - datetime.timedelta(days=1)).replace(day=1)
+    db_path = temp_db_path()
+    banque = load_app(db_path)
+    conn = connect(db_path)
+    seed_accounts(conn, args.legacy_accounts, last_interest_date=last_month, name_prefix='ancien')
+    conn.close()
+
+    with banque.app.app_context():
+        started = time.perf_counter()
+        for account in banque.Account.query.all():
+            account.apply_monthly_interest()
+        legacy = time.perf_counter() - started
+
+        banque.db.session.execute(banque.db.delete(banque.Transaction))
+        banque.db.session.execute(banque.db.delete(banque.Account))
+        banque.db.session.commit()
+
+    conn = connect(db_path)
+    seed_accounts(conn, args.accounts, last_interest_date=last_month)
+    conn.close()
+
+    with banque.app.app_context():
+        started = time.perf_counter()
+        processed = banque.apply_monthly_interest_bulk(args.chunk_size)
+        bulk = time.perf_counter() - started
+        assert processed == args.accounts
+        assert banque.apply_monthly_interest_bulk(args.chunk_size) == 0
+
+    legacy_rate = args.legacy_accounts / legacy
+    bulk_rate = args.accounts / bulk
+    print(f"ancien chemin : {args.legacy_accounts} comptes en {legacy:.2f}s ({legacy_rate:,.0f} comptes/s), "
+          f"soit ~{args.accounts / legacy_rate:,.0f}s extrapolées pour {args.accounts} comptes")
+    print(f"moteur par tranches : {args.accounts} comptes en {bulk:.2f}s ({bulk_rate:,.0f} comptes/s)")
+    print(f"gain : x{bulk_rate / legacy_rate:,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""Journal du Bank en mémoire : débit d'écriture selon la politique de fsync et temps de
+redémarrage (rejeu complet du journal contre instantané + queue de journal).
+
+    python benchmarks/bench_journal.py --postings 1000000 --accounts 1000 --tail 10000
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from common import ROOT
+
+sys.path.insert(0, ROOT)
+import bankcore  # noqa: E402
+from journal import FSYNC_ALWAYS, FSYNC_BATCH, FSYNC_OFF, JOURNAL_FILE, SNAPSHOT_FILE  # noqa: E402
+
+
+def post(bank: bankcore.Bank, members, postings: int):
+    for i in range(postings):
+        account = members[i % len(members)]
+        if i % 3:
+            account.deposit(12.5)
+        else:
+            account.withdraw(7.25)
+
+
+def open_bank(directory: str, fsync: str, accounts: int) -> bankcore.Bank:
+    bank = bankcore.Bank.open(directory, fsync)
+    # Pas d'instantané automatique : le scénario décide quand compacter
+    bank.store.snapshot_every = float('inf')
+    for i in range(accounts):
+        bank.create_account(f'client{i}', 1000.0, 0.02, '0000')
+    return bank
+
+
+def write_rate(fsync: str, postings: int, accounts: int) -> float:
+    directory = tempfile.mkdtemp(prefix='banque-journal-')
+    try:
+        bank = open_bank(directory, fsync, accounts)
+        started = time.perf_counter()
+        post(bank, list(bank.accounts.values()), postings)
+        bank.store.journal.sync()
+        elapsed = time.perf_counter() - started
+        bank.store.journal.close()
+        return postings / elapsed
+    finally:
+        shutil.rmtree(directory)
+
+
+def restart_time(directory: str) -> float:
+    started = time.perf_counter()
+    bank = bankcore.Bank.open(directory, FSYNC_OFF)
+    elapsed = time.perf_counter() - started
+    bank.store.journal.close()
+    return elapsed
+
+
+def size(directory: str, name: str) -> float:
+    path = os.path.join(directory, name)
+    return os.path.getsize(path) / 2**20 if os.path.exists(path) else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--postings', type=int, default=1_000_000)
+    parser.add_argument('--accounts', type=int, default=1000)
+    parser.add_argument('--tail', type=int, default=10_000, help="opérations journalisées après l'instantané")
+    parser.add_argument('--always-postings', type=int, default=2000, help="opérations pour la politique 'always'")
+    args = parser.parse_args()
+
+    print(f"{'fsync':>8} {'écritures/s':>13}")
+    for fsync, postings in ((FSYNC_ALWAYS, args.always_postings), (FSYNC_BATCH, args.postings), (FSYNC_OFF, args.postings)):
+        print(f"{fsync:>8} {write_rate(fsync, postings, args.accounts):>13,.0f}")
+
+    directory = tempfile.mkdtemp(prefix='banque-journal-')
+    try:
+        bank = open_bank(directory, FSYNC_OFF, args.accounts)
+        members = list(bank.accounts.values())
+        post(bank, members, args.postings)
+        bank.store.journal.close()
+        print(f"\nrejeu complet ({size(directory, JOURNAL_FILE):.1f} Mo de journal) : {restart_time(directory):.2f}s")
+
+        bank = bankcore.Bank.open(directory, FSYNC_OFF)
+        bank.store.snapshot_every = float('inf')
+        bank.store.snapshot(bank)
+        post(bank, list(bank.accounts.values()), args.tail)
+        bank.store.journal.close()
+        print(f"instantané ({size(directory, SNAPSHOT_FILE):.1f} Mo) + queue de {args.tail} opérations "
+              f"({size(directory, JOURNAL_FILE):.1f} Mo) : {restart_time(directory):.2f}s")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
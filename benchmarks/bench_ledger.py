@@ -0,0 +1,59 @@
+"""Mémoire et débit du Bank en mémoire : liste d'objets Transaction contre historique compact.
+
+    python benchmarks/bench_ledger.py --postings 1000000 --accounts 1000
+"""
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+
+from common import ROOT
+
+sys.path.insert(0, ROOT)
+import bankcore  # noqa: E402
+
+
+def run(compact: bool, postings: int, accounts: int) -> dict:
+    gc.collect()
+    tracemalloc.start()
+    bank = bankcore.Bank(compact_ledger=compact)
+    for i in range(accounts):
+        bank.create_account(f'client{i}', 1000.0, 0.02, '0000')
+    members = list(bank.accounts.values())
+
+    started = time.perf_counter()
+    for i in range(postings):
+        account = members[i % accounts]
+        if i % 3:
+            account.deposit(12.5)
+        else:
+            account.withdraw(7.25)
+    write_time = time.perf_counter() - started
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    total = 0.0
+    for account in members:
+        for transaction in account.get_transactions():
+            total += transaction.amount
+    read_time = time.perf_counter() - started
+    return {'memory': memory, 'write': postings / write_time, 'read': postings / read_time}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--postings', type=int, default=1_000_000)
+    parser.add_argument('--accounts', type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"{'historique':>12} {'mémoire':>12} {'octets/op.':>11} {'écritures/s':>13} {'lectures/s':>13}")
+    for label, compact in (('objets', False), ('compact', True)):
+        result = run(compact, args.postings, args.accounts)
+        print(f"{label:>12} {result['memory'] / 2**20:>9.1f} Mo {result['memory'] / args.postings:>11.1f} "
+              f"{result['write']:>13,.0f} {result['read']:>13,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""Résumé mensuel d'un compte : agrégats MonthlySummary contre GROUP BY sur les transactions.
+
+    python benchmarks/bench_monthly_summary.py --sizes 10000 100000 1000000 --postings 2000
+"""
+import argparse
+import time
+
+from sqlalchemy import event
+
+from common import connect, load_app, seed_accounts, seed_transactions, temp_db_path, timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--postings', type=int, default=2000, help="dépôts pour mesurer le surcoût à l'écriture")
+    args = parser.parse_args()
+
+    db_path = temp_db_path()
+    banque = load_app(db_path)
+    conn = connect(db_path)
+    account_id, _ = seed_accounts(conn, 1)
+    noise_id, _ = seed_accounts(conn, 1, name_prefix='bruit')
+    db, Transaction, MonthlySummary = banque.db, banque.Transaction, banque.MonthlySummary
+
+    print(f"{'transactions':>12} {'reconstruction':>15} {'GROUP BY 12 mois':>17} {'agrégats 12 mois':>17}")
+    seeded = 0
+    for size in sorted(args.sizes):
+        # Une transaction toutes les 7 minutes : les 12 derniers mois couvrent ~75 000 lignes
+        seed_transactions(conn, account_id, size - seeded)
+        seed_transactions(conn, noise_id, size - seeded)
+        seeded = size
+        conn.execute('ANALYZE')
+        conn.commit()
+
+        with banque.app.app_context():
+            started = time.perf_counter()
+            banque.rebuild_monthly_summaries()
+            rebuild = time.perf_counter() - started
+            last = db.session.query(db.func.max(Transaction.date)).scalar().date().replace(day=1)
+            first = banque.month_offset(last, -11)
+            month = db.func.date(Transaction.date, 'start of month')
+
+            def scan():
+                db.session.execute(
+                    db.select(month, Transaction.transaction_type, Transaction.is_incoming,
+                              db.func.count(), db.func.sum(Transaction.amount))
+                    .where(Transaction.account_id == account_id, Transaction.date >= first)
+                    .group_by(month, Transaction.transaction_type, Transaction.is_incoming)
+                ).all()
+
+            def summary():
+                db.session.execute(db.select(MonthlySummary).where(
+                    MonthlySummary.account_id == account_id, MonthlySummary.month >= first,
+                    MonthlySummary.month <= last)).all()
+
+            print(f'{size:>12} {rebuild * 1000:>13.1f}ms {timed(scan):>15.2f}ms {timed(summary):>15.2f}ms')
+
+    with banque.app.app_context():
+        account = db.session.get(banque.Account, account_id)
+
+        def deposits() -> float:
+            started = time.perf_counter()
+            for _ in range(args.postings):
+                account.deposit(1.0)
+            return args.postings / (time.perf_counter() - started)
+
+        with_summary = deposits()
+        event.remove(db.session, 'after_flush', banque.summarize_new_transactions)
+        without_summary = deposits()
+        event.listen(db.session, 'after_flush', banque.summarize_new_transactions)
+    print(f"dépôts : {with_summary:,.0f}/s avec agrégats, {without_summary:,.0f}/s sans (base : {db_path})")
+
+
+if __name__ == '__main__':
+    main()
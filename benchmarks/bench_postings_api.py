@@ -0,0 +1,116 @@
+"""Débit d'écriture : formulaires /deposit, /withdraw, /transfer contre l'API /api/postings.
+
+Le même lot d'opérations aléatoires est rejoué une fois par les formulaires (un client
+connecté par compte, une requête et un commit par opération) puis par l'API, par lots de
+--batch-size opérations. Les soldes doivent évoluer exactement de la même façon.
+
+    python benchmarks/bench_postings_api.py --operations 5000 --batch-size 1000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+
+from common import connect, load_app, seed_accounts, temp_db_path
+
+API_TOKEN = 'bench'
+
+
+def make_operations(count: int, names, seed: int = 0):
+    rng = random.Random(seed)
+    operations = []
+    for _ in range(count):
+        choice = rng.random()
+        account = rng.choice(names)
+        if choice < 0.5:
+            operations.append({'type': 'deposit', 'account': account, 'amount': 10.0})
+        elif choice < 0.8:
+            operations.append({'type': 'withdraw', 'account': account, 'amount': 5.0})
+        else:
+            operations.append({'type': 'transfer', 'account': account, 'to_account': rng.choice(names), 'amount': 1.0})
+    return operations
+
+
+def expected_deltas(operations):
+    # Soldes initiaux assez élevés : aucune opération n'est refusée
+    deltas = defaultdict(float)
+    for operation in operations:
+        if operation['type'] == 'deposit':
+            deltas[operation['account']] += operation['amount']
+        else:
+            deltas[operation['account']] -= operation['amount']
+            if operation['type'] == 'transfer':
+                deltas[operation['to_account']] += operation['amount']
+    return deltas
+
+
+def balances(banque):
+    with banque.app.app_context():
+        return {account.name: account.balance for account in banque.Account.query}
+
+
+def post_forms(banque, operations) -> float:
+    clients = {}
+    started = time.perf_counter()
+    for operation in operations:
+        client = clients.get(operation['account'])
+        if client is None:
+            client = clients[operation['account']] = banque.app.test_client()
+            client.post('/login', data={'name': operation['account'], 'pin': '0000'})
+        if operation['type'] == 'transfer':
+            response = client.post('/transfer', data={
+                'to_account_name': operation['to_account'], 'amount': operation['amount'], 'pin': '0000',
+            })
+        else:
+            response = client.post(f"/{operation['type']}", data={'amount': operation['amount']})
+        assert response.status_code == 302, response.status_code
+    return time.perf_counter() - started
+
+
+def post_batches(banque, operations, batch_size: int) -> float:
+    client = banque.app.test_client()
+    headers = {'Authorization': f'Bearer {API_TOKEN}'}
+    started = time.perf_counter()
+    for start in range(0, len(operations), batch_size):
+        response = client.post('/api/postings', json=operations[start:start + batch_size], headers=headers)
+        assert response.status_code == 200 and not response.json['failed'], response.json
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--operations', type=int, default=5000)
+    parser.add_argument('--accounts', type=int, default=200)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    os.environ['BANQUE_API_TOKEN'] = API_TOKEN
+    db_path = temp_db_path()
+    banque = load_app(db_path)
+    conn = connect(db_path)
+    first_id, last_id = seed_accounts(conn, args.accounts, balance=1_000_000.0)
+    conn.close()
+    names = [f'client{account_id}' for account_id in range(first_id, last_id + 1)]
+    operations = make_operations(args.operations, names)
+    deltas = expected_deltas(operations)
+
+    failures = []
+    for label, run in (('formulaires', lambda: post_forms(banque, operations)),
+                       (f'API, lots de {args.batch_size}', lambda: post_batches(banque, operations, args.batch_size))):
+        before = balances(banque)
+        elapsed = run()
+        after = balances(banque)
+        print(f"{label:>20} : {len(operations) / elapsed:>9,.0f} opérations/s ({elapsed:.2f}s)")
+        wrong = [name for name in names if abs(after[name] - before[name] - deltas[name]) > 1e-6]
+        if wrong:
+            failures.append(f"{label} : {len(wrong)} solde(s) incorrect(s)")
+    for failure in failures:
+        print("ÉCHEC :", failure)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Projection des intérêts : moteur NumPy vectorisé contre une boucle Python compte par compte.
+
+    python benchmarks/bench_projection.py --accounts 1000000 --months 12 120
+"""
+import argparse
+import time
+
+from common import connect, load_app, seed_accounts, temp_db_path
+
+RATES = (0.0, 0.01, 0.02, 0.035)
+SCENARIOS = {'base': 0.0, 'hausse': 0.01, 'baisse progressive': [0.0, -0.0025, -0.005, -0.0075, -0.01]}
+
+
+def python_projection(balances, rates, months: int, shifts) -> float:
+    # Référence naïve : un compte, un mois, un scénario à la fois
+    total = 0.0
+    for balance, rate in zip(balances, rates):
+        for month in range(months):
+            shift = shifts[min(month, len(shifts) - 1)] if isinstance(shifts, list) else shifts
+            balance += balance * ((rate + shift) / 12)
+        total += balance
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--accounts', type=int, default=1_000_000)
+    parser.add_argument('--months', type=int, nargs='+', default=[12, 120])
+    parser.add_argument('--python-accounts', type=int, default=20_000, help="échantillon pour la boucle Python")
+    args = parser.parse_args()
+
+    db_path = temp_db_path()
+    banque = load_app(db_path)
+    conn = connect(db_path)
+    # Quatre taux différents, par quarts de la base
+    for rate in RATES:
+        seed_accounts(conn, args.accounts // 4, balance=1500.0, interest_rate=rate)
+    conn.close()
+
+    with banque.app.app_context():
+        import numpy as np
+        from projection import project
+
+        rates = np.repeat(RATES, args.accounts // 4)
+        started = time.perf_counter()
+        ids, _ = banque.project_portfolio(1, None)
+        print(f"chargement de {len(ids):,} comptes : {time.perf_counter() - started:.2f}s")
+
+        for months in args.months:
+            started = time.perf_counter()
+            ids, result = banque.project_portfolio(months, SCENARIOS)
+            total = time.perf_counter() - started
+            started = time.perf_counter()
+            project(result.initial, rates, months, SCENARIOS)
+            compute = time.perf_counter() - started
+
+            sample = args.python_accounts
+            started = time.perf_counter()
+            for shifts in SCENARIOS.values():
+                python_projection(result.initial[:sample].tolist(), rates[:sample].tolist(), months, shifts)
+            python_rate = sample / (time.perf_counter() - started)
+            print(f"{months:>4} mois, {len(SCENARIOS)} scénarios : {total:.2f}s avec chargement, "
+                  f"{compute:.2f}s de calcul ; boucle Python ≈ {len(ids) / python_rate:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Rapprochement du grand livre : soldes stockés contre point de contrôle d'ouverture + transactions.
+
+    python benchmarks/bench_reconcile.py --accounts 100000 --per-account 100 --workers 1 2 4
+
+Quelques soldes sont faussés après le remplissage ; chaque passe doit les retrouver tous.
+"""
+import argparse
+import time
+
+from common import connect, load_app, seed_accounts, seed_history, temp_db_path
+
+OPENING_BALANCE = 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--accounts', type=int, default=100_000)
+    parser.add_argument('--per-account', type=int, default=100)
+    parser.add_argument('--drifts', type=int, default=25, help="soldes faussés à retrouver")
+    parser.add_argument('--chunk-size', type=int, default=10_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    args = parser.parse_args()
+
+    db_path = temp_db_path()
+    banque = load_app(db_path)
+    conn = connect(db_path)
+    started = time.perf_counter()
+    first_id, last_id = seed_accounts(conn, args.accounts, balance=OPENING_BALANCE)
+    seed_history(conn, first_id, last_id, args.per_account)
+    conn.execute(
+        'INSERT INTO balance_checkpoint (account_id, taken_at, balance, last_transaction_id) '
+        "SELECT id, '2019-12-31 00:00:00.000000', balance, 0 FROM account"
+    )
+    conn.execute(
+        'UPDATE account SET balance = balance + (SELECT coalesce(sum(CASE WHEN transaction_type = ? '
+        'THEN -amount ELSE amount END), 0) FROM "transaction" WHERE account_id = account.id)',
+        ('Retrait',),
+    )
+    step = max(args.accounts // max(args.drifts, 1), 1)
+    drifted = conn.execute('UPDATE account SET balance = balance + 0.5 WHERE (id - ?) % ? = 0 AND id - ? < ?',
+                           (first_id, step, first_id, step * args.drifts)).rowcount
+    conn.execute('ANALYZE')
+    conn.commit()
+    conn.close()
+    transactions = args.accounts * args.per_account
+    print(f"{args.accounts:,} comptes, {transactions:,} transactions, {drifted} soldes faussés "
+          f"(remplissage {time.perf_counter() - started:.1f}s)")
+
+    with banque.app.app_context():
+        for workers in args.workers:
+            found = []
+            started = time.perf_counter()
+            summary = banque.reconcile_ledger(args.chunk_size, workers, report=lambda *row: found.append(row[0]))
+            elapsed = time.perf_counter() - started
+            status = 'ok' if summary.discrepancies == drifted and summary.transactions == transactions else 'ÉCHEC'
+            print(f"  {workers} processus : {elapsed:6.2f}s  {transactions / elapsed:>12,.0f} transactions/s  "
+                  f"{summary.discrepancies} écart(s) [{status}]")
+    print(f"(base : {db_path})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Recherche de transactions : latence de /api/search en fonction de la taille de la table.
+
+    python benchmarks/bench_search.py --sizes 100000 1000000 3000000
+
+Un tiers des transactions sont des transferts décrits « vers clientN » / « de clientN ».
+La dernière colonne est la même recherche de texte en LIKE, sans index, pour comparaison.
+"""
+import argparse
+import datetime
+
+from common import SQLITE_DATETIME_FORMAT, batched, connect, load_app, seed_accounts, temp_db_path, timed
+
+ACCOUNTS = 10_000
+START = datetime.datetime(2020, 1, 1)
+STEP = datetime.timedelta(minutes=3)
+
+
+def seed(conn, first: int, count: int):
+    def rows():
+        for i in range(first, first + count):
+            account_id = i % ACCOUNTS + 1
+            date = (START + i * STEP).strftime(SQLITE_DATETIME_FORMAT)
+            amount = float((i * 7919) % 200_000) / 100
+            if i % 3:
+                yield amount, 'Dépôt' if i % 3 == 1 else 'Retrait', None, 1, date, account_id
+            else:
+                other = (i * 31) % ACCOUNTS + 1
+                yield amount, 'Transfert', f'vers client{other}', 0, date, account_id
+    for batch in batched(rows()):
+        conn.executemany(
+            'INSERT INTO "transaction" (amount, transaction_type, description, is_incoming, date, account_id) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            batch,
+        )
+    conn.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    db_path = temp_db_path()
+    banque = load_app(db_path)
+    conn = connect(db_path)
+    seed_accounts(conn, ACCOUNTS)
+
+    print(f"{'transactions':>12} {'texte rare':>11} {'texte fréquent':>15} {'page 2':>8} "
+          f"{'transferts 500-1000€ trimestre':>31} {'montant exact':>14} {'un jour':>8} {'LIKE':>9}")
+    seeded = 0
+    for size in sorted(args.sizes):
+        seed(conn, seeded, size - seeded)
+        seeded = size
+        conn.execute('ANALYZE')
+        conn.commit()
+        last = START + (size - 1) * STEP
+        quarter_start = (last - datetime.timedelta(days=90)).date()
+        middle = (START + size // 2 * STEP).date()
+
+        with banque.app.app_context():
+            search = banque.search_transactions
+            _, cursor = search(banque.fts_query('vers'))
+            cases = [
+                lambda: search(banque.fts_query('vers client4242')),
+                lambda: search(banque.fts_query('vers')),
+                lambda: search(banque.fts_query('vers'), cursor=cursor),
+                lambda: search(transaction_type='Transfert', min_amount=500, max_amount=1000,
+                               start=quarter_start, end=last.date()),
+                lambda: search(min_amount=1234.56, max_amount=1234.56),
+                lambda: search(start=middle, end=middle),
+                lambda: banque.Transaction.query.filter(
+                    banque.Transaction.description.like('%client4242')).limit(50).all(),
+            ]
+            timings = [timed(case) for case in cases]
+        print(f'{size:>12} {timings[0]:>9.2f}ms {timings[1]:>13.2f}ms {timings[2]:>6.2f}ms '
+              f'{timings[3]:>29.2f}ms {timings[4]:>12.2f}ms {timings[5]:>6.2f}ms {timings[6]:>7.1f}ms')
+    print(f"(meilleur de 5 ; base : {db_path})")
+
+
+if __name__ == '__main__':
+    main()
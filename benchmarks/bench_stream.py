@@ -0,0 +1,76 @@
+"""Flux /account/stream : délai entre l'envoi d'un dépôt et sa réception par les abonnés.
+
+    python benchmarks/bench_stream.py --subscribers 50 --postings 200
+
+Chaque abonné est un client connecté au même compte qui lit le flux dans son propre thread ;
+un écrivain enchaîne les dépôts. Le même suivi par scrutation de /account coûterait une
+requête HTTP (et une lecture du compte) par client et par intervalle.
+"""
+import argparse
+import os
+import threading
+import time
+
+from common import load_app, percentile, temp_db_path
+
+os.environ.setdefault('BANQUE_STREAM_HEARTBEAT', '0.5')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--subscribers', type=int, default=50)
+    parser.add_argument('--postings', type=int, default=200)
+    args = parser.parse_args()
+
+    banque = load_app(temp_db_path())
+    client = banque.app.test_client()
+    client.post('/create_account', data={'name': 'client', 'initial_balance': '0', 'interest_rate': '0.01', 'pin': '0000'})
+
+    received = [[] for _ in range(args.subscribers)]
+    ready = threading.Barrier(args.subscribers + 1)
+    done = threading.Event()
+
+    def subscriber(index: int):
+        reader = banque.app.test_client()
+        reader.post('/login', data={'name': 'client', 'pin': '0000'})
+        response = reader.get('/account/stream')
+        chunks = iter(response.response)
+        next(chunks)  # retry
+        next(chunks)  # solde initial
+        ready.wait()
+        for chunk in chunks:
+            if b'event: transaction' in chunk:
+                received[index].append(time.perf_counter())
+                if len(received[index]) == args.postings:
+                    break
+            elif done.is_set():
+                break
+        response.close()
+
+    threads = [threading.Thread(target=subscriber, args=(index,)) for index in range(args.subscribers)]
+    for thread in threads:
+        thread.start()
+    ready.wait()
+
+    writer = banque.app.test_client()
+    writer.post('/login', data={'name': 'client', 'pin': '0000'})
+    sent = []
+    started = time.perf_counter()
+    for _ in range(args.postings):
+        sent.append(time.perf_counter())
+        writer.post('/deposit', data={'amount': '1'})
+    elapsed = time.perf_counter() - started
+    done.set()
+    for thread in threads:
+        thread.join()
+
+    delays = sorted((receipt - start) * 1000 for times in received for receipt, start in zip(times, sent))
+    complete = sum(len(times) == args.postings for times in received)
+    print(f"{args.postings} dépôts en {elapsed:.2f}s, {args.subscribers} abonnés ({complete} ont tout reçu)")
+    print(f"délai envoi du dépôt → réception : p50 {percentile(delays, 0.5):.2f} ms, p99 {percentile(delays, 0.99):.2f} ms, "
+          f"max {delays[-1]:.2f} ms")
+    print(f"débordements de file : {banque.event_hub.overflows}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""Outils partagés par les scripts de benchmark (base SQLite temporaire, données de test)."""
+import datetime
+import math
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from typing import Iterable, Iterator, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SQLITE_DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+SEED_BATCH_SIZE = 50_000
+
+
+def temp_db_path(prefix: str = 'banque-bench-') -> str:
+    return os.path.join(tempfile.mkdtemp(prefix=prefix), 'banque.db')
+
+
+def load_app(db_path: str):
+    # L'URI doit être fixée avant l'import : app.py crée le moteur au chargement
+    os.environ['BANQUE_DATABASE_URI'] = 'sqlite:///' + db_path
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    import app as banque_app
+    with banque_app.app.app_context():
+        banque_app.init_db()
+    return banque_app
+
+
+def connect(db_path: str) -> sqlite3.Connection:
+    # Connexion brute réservée au remplissage : pas de fsync, pas de journal sur disque.
+    # Une base en WAL y reste : en sortir exige qu'aucune autre connexion ne soit ouverte.
+    conn = sqlite3.connect(db_path)
+    conn.execute('PRAGMA synchronous = OFF')
+    if conn.execute('PRAGMA journal_mode').fetchone()[0] != 'wal':
+        conn.execute('PRAGMA journal_mode = MEMORY')
+    return conn
+
+
+def batched(rows: Iterable, size: int = SEED_BATCH_SIZE) -> Iterator[List]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def seed_accounts(conn: sqlite3.Connection, count: int, balance: float = 1000.0, interest_rate: float = 0.02,
+                  last_interest_date: datetime.date = None, name_prefix: str = 'client') -> Tuple[int, int]:
+    last_interest_date = last_interest_date or datetime.date.today().replace(day=1)
+    first_id = (conn.execute('SELECT coalesce(max(id), 0) FROM account').fetchone()[0]) + 1
+    rows = (
+        (first_id + i, f'{name_prefix}{first_id + i}', balance, interest_rate, '0000', last_interest_date.isoformat())
+        for i in range(count)
+    )
+    for batch in batched(rows):
+        conn.executemany(
+            'INSERT INTO account (id, name, balance, interest_rate, pin, last_interest_date) VALUES (?, ?, ?, ?, ?, ?)',
+            batch,
+        )
+    conn.commit()
+    return first_id, first_id + count - 1
+
+
+def seed_transactions(conn: sqlite3.Connection, account_id: int, count: int,
+                      start: datetime.datetime = datetime.datetime(2015, 1, 1),
+                      step: datetime.timedelta = datetime.timedelta(minutes=7)) -> None:
+    # Dates strictement croissantes, au format de stockage du type DateTime de SQLAlchemy
+    last = conn.execute(
+        'SELECT max(date) FROM "transaction" WHERE account_id = ?', (account_id,)
+    ).fetchone()[0]
+    if last:
+        start = datetime.datetime.strptime(last, SQLITE_DATETIME_FORMAT) + step
+    rows = (
+        (10.0 + i % 90, 'Dépôt' if i % 3 else 'Retrait', None, 1,
+         (start + i * step).strftime(SQLITE_DATETIME_FORMAT), account_id)
+        for i in range(count)
+    )
+    for batch in batched(rows):
+        conn.executemany(
+            'INSERT INTO "transaction" (amount, transaction_type, description, is_incoming, date, account_id) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            batch,
+        )
+    conn.commit()
+
+
+def seed_history(conn: sqlite3.Connection, first_id: int, last_id: int, per_account: int,
+                 start: datetime.datetime = datetime.datetime(2020, 1, 1),
+                 step: datetime.timedelta = datetime.timedelta(hours=5)) -> None:
+    # Même historique synthétique pour chaque compte de [first_id, last_id], en un seul flux d'insertions
+    rows = (
+        (10.0 + i % 90, 'Dépôt' if i % 3 else 'Retrait', None, 1,
+         (start + i * step).strftime(SQLITE_DATETIME_FORMAT), account_id)
+        for account_id in range(first_id, last_id + 1)
+        for i in range(per_account)
+    )
+    for batch in batched(rows):
+        conn.executemany(
+            'INSERT INTO "transaction" (amount, transaction_type, description, is_incoming, date, account_id) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            batch,
+        )
+    conn.commit()
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    # Rang le plus proche (plafond de fraction × n) ; `sorted_values` doit être trié. L'arrondi
+    # préalable évite qu'une erreur de flottant (0.07 × 100 = 7.000000000000001) ne décale d'un rang.
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(round(fraction * len(sorted_values), 9)) - 1))
+    return sorted_values[rank]
+
+
+def git_revision() -> str:
+    try:
+        import subprocess
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'inconnu'
+
+
+def timed(func, repeat: int = 5) -> float:
+    # Meilleur temps sur `repeat` exécutions, en millisecondes
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
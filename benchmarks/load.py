@@ -0,0 +1,216 @@
+"""Test de charge reproductible de l'application web.
+
+Remplit une base SQLite temporaire, puis N workers concurrents rejouent un mélange
+réaliste de connexions, consultations, dépôts, retraits, transferts et historiques,
+via le client de test Flask ou un serveur WSGI local. Le rapport JSON (débit et
+p50/p95/p99 par route) peut être archivé pour comparer les commits entre eux.
+
+    python benchmarks/load.py --accounts 1000 --transactions 100 --workers 8 --duration 10
+    python benchmarks/load.py --server --output resultats.json
+    python benchmarks/load.py --env BANQUE_GROUP_COMMIT=1
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import threading
+import time
+from typing import Dict, List, Tuple
+from urllib.parse import urlencode
+
+from common import connect, git_revision, percentile, seed_accounts, seed_history, temp_db_path
+
+DEFAULT_MIX = 'login=5,account=30,deposit=15,withdraw=10,transfer=10,history=30'
+PIN = '0000'
+
+
+class TestClientSession:
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method: str, path: str, form: Dict = None) -> int:
+        response = self.client.open(path, method=method, data=form)
+        response.close()
+        return response.status_code
+
+
+class HttpSession:
+    # Connexion HTTP persistante par worker ; le cookie de session Flask est renvoyé à la main
+    def __init__(self, host: str, port: int):
+        self.connection = http.client.HTTPConnection(host, port, timeout=60)
+        self.cookie = None
+
+    def request(self, method: str, path: str, form: Dict = None) -> int:
+        headers = {'Cookie': self.cookie} if self.cookie else {}
+        body = None
+        if form is not None:
+            body = urlencode(form)
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        try:
+            self.connection.request(method, path, body=body, headers=headers)
+            response = self.connection.getresponse()
+            response.read()
+        except (http.client.HTTPException, OSError):
+            self.connection.close()
+            raise
+        cookie = response.getheader('Set-Cookie')
+        if cookie:
+            self.cookie = cookie.split(';', 1)[0]
+        return response.status
+
+
+def parse_mix(mix: str) -> Tuple[List[str], List[int]]:
+    operations, weights = [], []
+    for item in mix.split(','):
+        name, _, weight = item.partition('=')
+        operations.append(name.strip())
+        weights.append(int(weight))
+    return operations, weights
+
+
+def run_worker(http_session, rng: random.Random, accounts: Tuple[int, int], operations, weights,
+               deadline: float, max_requests: int, samples: Dict[str, List[float]], errors: Dict[str, int]):
+    first_id, last_id = accounts
+
+    def timed_request(route: str, method: str, path: str, form: Dict = None):
+        started = time.perf_counter()
+        try:
+            status = http_session.request(method, path, form)
+        except Exception:
+            status = None
+        samples.setdefault(route, []).append(time.perf_counter() - started)
+        if status is None or status >= 400:
+            errors[route] = errors.get(route, 0) + 1
+
+    def login():
+        timed_request('/login', 'POST', '/login', {'name': f'client{rng.randint(first_id, last_id)}', 'pin': PIN})
+
+    login()
+    done = 1
+    while time.perf_counter() < deadline and (not max_requests or done < max_requests):
+        operation = rng.choices(operations, weights)[0]
+        if operation == 'login':
+            login()
+        elif operation == 'account':
+            timed_request('/account', 'GET', '/account')
+        elif operation == 'deposit':
+            timed_request('/deposit', 'POST', '/deposit', {'amount': str(rng.randint(1, 200))})
+        elif operation == 'withdraw':
+            timed_request('/withdraw', 'POST', '/withdraw', {'amount': str(rng.randint(1, 200))})
+        elif operation == 'transfer':
+            timed_request('/transfer', 'POST', '/transfer', {
+                'to_account_name': f'client{rng.randint(first_id, last_id)}',
+                'amount': str(rng.randint(1, 100)),
+                'pin': PIN,
+            })
+        elif operation == 'history':
+            timed_request('/history', 'GET', '/history')
+        done += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--accounts', type=int, default=1000)
+    parser.add_argument('--transactions', type=int, default=100, help="transactions existantes par compte")
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10.0, help="durée de la charge en secondes")
+    parser.add_argument('--requests', type=int, default=0, help="plafond de requêtes par worker (0 : aucun)")
+    parser.add_argument('--mix', default=DEFAULT_MIX, help="pondération des opérations")
+    parser.add_argument('--server', action='store_true', help="passer par un serveur WSGI local plutôt que le client de test")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--env', action='append', default=[], metavar='CLE=VALEUR',
+                        help="variable d'environnement fixée avant l'import de l'application")
+    parser.add_argument('--db', help="base SQLite à utiliser (par défaut : fichier temporaire)")
+    parser.add_argument('--label', default=None, help="étiquette du rapport (par défaut : révision git)")
+    parser.add_argument('--output', help="fichier où écrire le rapport JSON")
+    args = parser.parse_args()
+
+    for assignment in args.env:
+        key, _, value = assignment.partition('=')
+        os.environ[key] = value
+    from common import load_app
+
+    db_path = args.db or temp_db_path()
+    banque = load_app(db_path)
+    conn = connect(db_path)
+    if conn.execute('SELECT count(*) FROM account').fetchone()[0] == 0:
+        accounts = seed_accounts(conn, args.accounts, balance=10_000.0)
+        seed_history(conn, accounts[0], accounts[1], args.transactions)
+    accounts = conn.execute('SELECT min(id), max(id) FROM account').fetchone()
+    conn.close()
+
+    server = None
+    if args.server:
+        from werkzeug.serving import WSGIRequestHandler, make_server
+
+        class QuietRequestHandler(WSGIRequestHandler):
+            def log_request(self, *args, **kwargs):
+                pass
+
+        server = make_server('127.0.0.1', 0, banque.app, threaded=True, request_handler=QuietRequestHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        new_session = lambda: HttpSession('127.0.0.1', server.server_port)
+    else:
+        new_session = lambda: TestClientSession(banque.app)
+
+    operations, weights = parse_mix(args.mix)
+    samples: List[Dict[str, List[float]]] = [{} for _ in range(args.workers)]
+    errors: List[Dict[str, int]] = [{} for _ in range(args.workers)]
+    started = time.perf_counter()
+    deadline = started + args.duration
+    threads = [
+        threading.Thread(target=run_worker, args=(
+            new_session(), random.Random(args.seed + i), accounts, operations, weights,
+            deadline, args.requests, samples[i], errors[i],
+        ))
+        for i in range(args.workers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    if server:
+        server.shutdown()
+
+    routes = {}
+    total = 0
+    for route in sorted({route for worker in samples for route in worker}):
+        latencies = sorted(latency for worker in samples for latency in worker.get(route, []))
+        total += len(latencies)
+        routes[route] = {
+            'count': len(latencies),
+            'errors': sum(worker.get(route, 0) for worker in errors),
+            'throughput_rps': round(len(latencies) / elapsed, 1),
+            'mean_ms': round(sum(latencies) / len(latencies) * 1000, 3),
+            'p50_ms': round(percentile(latencies, 0.50) * 1000, 3),
+            'p95_ms': round(percentile(latencies, 0.95) * 1000, 3),
+            'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+        }
+    report = {
+        'label': args.label or git_revision(),
+        'config': {
+            'accounts': args.accounts,
+            'transactions_per_account': args.transactions,
+            'workers': args.workers,
+            'duration_s': args.duration,
+            'mix': args.mix,
+            'transport': 'wsgi' if args.server else 'test_client',
+            'seed': args.seed,
+            'env': args.env,
+        },
+        'elapsed_s': round(elapsed, 3),
+        'requests': total,
+        'throughput_rps': round(total / elapsed, 1),
+        'routes': routes,
+    }
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as handle:
+            handle.write(output + '\n')
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""Test de charge multi-thread : aucun euro ne doit être créé ni perdu.
+
+Plusieurs threads enchaînent transferts, dépôts et retraits sur un petit nombre de
+comptes (forte contention). À la fin, la somme des soldes doit égaler la somme
+initiale plus les dépôts moins les retraits réussis, aucun solde ne doit être
+négatif et chaque solde doit correspondre à son historique.
+
+    python benchmarks/stress_transfers.py --threads 32 --operations 200
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+
+from common import connect, load_app, seed_accounts, temp_db_path
+
+INITIAL_BALANCE = 100
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=32)
+    parser.add_argument('--operations', type=int, default=200, help="opérations par thread")
+    parser.add_argument('--accounts', type=int, default=10)
+    parser.add_argument('--group-commit', action='store_true')
+    args = parser.parse_args()
+
+    db_path = temp_db_path()
+    banque = load_app(db_path)
+    conn = connect(db_path)
+    seed_accounts(conn, args.accounts, balance=INITIAL_BALANCE)
+    conn.close()
+    if args.group_commit:
+        banque.enable_group_commit()
+
+    lock = threading.Lock()
+    totals = {'deposited': 0, 'withdrawn': 0, 'refused': 0}
+
+    def worker(seed: int):
+        rng = random.Random(seed)
+        deposited = withdrawn = refused = 0
+        with banque.app.app_context():
+            for _ in range(args.operations):
+                account = banque.db.session.get(banque.Account, rng.randint(1, args.accounts))
+                # Montants entiers : les sommes en flottants restent exactes
+                amount = rng.randint(1, 60)
+                choice = rng.random()
+                if choice < 0.7:
+                    to_account = banque.db.session.get(banque.Account, rng.randint(1, args.accounts))
+                    ok = account.transfer(to_account, amount)
+                elif choice < 0.85:
+                    account.deposit(amount)
+                    deposited += amount
+                    ok = True
+                else:
+                    ok = account.withdraw(amount)
+                    withdrawn += amount if ok else 0
+                refused += not ok
+                banque.db.session.remove()
+        with lock:
+            totals['deposited'] += deposited
+            totals['withdrawn'] += withdrawn
+            totals['refused'] += refused
+
+    pool = [threading.Thread(target=worker, args=(seed,)) for seed in range(args.threads)]
+    started = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    if args.group_commit:
+        banque.disable_group_commit()
+
+    failures = []
+    with banque.app.app_context():
+        accounts = banque.Account.query.all()
+        total = sum(account.balance for account in accounts)
+        expected = args.accounts * INITIAL_BALANCE + totals['deposited'] - totals['withdrawn']
+        if total != expected:
+            failures.append(f"somme des soldes {total} != {expected} attendus")
+        for account in accounts:
+            if account.balance < 0:
+                failures.append(f"{account.name} : solde négatif {account.balance}")
+            ledger = INITIAL_BALANCE
+            for transaction in account.transactions:
+                outgoing = transaction.transaction_type == 'Retrait' or (
+                    transaction.transaction_type == 'Transfert' and not transaction.is_incoming)
+                ledger += -transaction.amount if outgoing else transaction.amount
+            if ledger != account.balance:
+                failures.append(f"{account.name} : solde {account.balance} != historique {ledger}")
+
+    operations = args.threads * args.operations
+    print(f"{operations} opérations en {elapsed:.2f}s ({operations / elapsed:,.0f}/s), "
+          f"{totals['refused']} refusée(s) pour solde insuffisant")
+    for failure in failures:
+        print("ÉCHEC :", failure)
+    if failures:
+        sys.exit(1)
+    print(f"OK : {total:.0f}€ au total, conforme aux dépôts et retraits")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+import collections
+import threading
+import time
+from typing import Callable, Dict, Hashable, Optional
+
+
+class VersionedCache:
+    # Cache LRU en lecture traversante, borné en taille et en durée de vie. Chaque clé porte
+    # un numéro de version que `bump` incrémente après une écriture validée : une valeur
+    # chargée pendant qu'une écriture invalidait la clé n'est pas conservée. Les versions ne
+    # sont suivies que pour les clés présentes ou en cours de chargement.
+    # `revalidate_after` (secondes, None : jamais) : au-delà, une entrée trouvée est confirmée
+    # par `validate` avant d'être servie ; en deçà, un succès ne coûte aucun accès à la source.
+
+    def __init__(self, max_entries: int = 10_000, ttl: float = 30.0, revalidate_after: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.revalidate_after = revalidate_after
+        self._entries: 'collections.OrderedDict[Hashable, tuple]' = collections.OrderedDict()
+        self._versions: Dict[Hashable, int] = {}
+        self._loading: Dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable, load: Callable[[Hashable], Optional[object]],
+            validate: Optional[Callable[[Hashable, object], bool]] = None):
+        # `validate(clé, valeur)` confirme une entrée trouvée auprès de la source, pour les
+        # écritures que `bump` ne voit pas (autres processus) ; une entrée refusée est rechargée
+        with self._lock:
+            entry = self._lookup(key)
+        if entry is not None:
+            version, expires, cached, checked = entry
+            now = time.monotonic()
+            if validate is None or self.revalidate_after is None or now - checked < self.revalidate_after:
+                with self._lock:
+                    self.hits += 1
+                return cached
+            if validate(key, cached):
+                with self._lock:
+                    self.hits += 1
+                    if self._entries.get(key) is entry:
+                        self._entries[key] = (version, expires, cached, now)
+                return cached
+            self.bump(key)
+
+        with self._lock:
+            self.misses += 1
+            version = self._versions.get(key, 0)
+            self._loading[key] = self._loading.get(key, 0) + 1
+
+        value = None
+        try:
+            value = load(key)
+        finally:
+            with self._lock:
+                self._loading[key] -= 1
+                if value is not None and self._versions.get(key, 0) == version:
+                    now = time.monotonic()
+                    self._entries[key] = (version, now + self.ttl, value, now)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        evicted, _ = self._entries.popitem(last=False)
+                        self._forget(evicted)
+                        self.evictions += 1
+                if not self._loading[key]:
+                    del self._loading[key]
+                    if key not in self._entries:
+                        self._versions.pop(key, None)
+        return value
+
+    def _lookup(self, key: Hashable) -> Optional[tuple]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            version, expires = entry[:2]
+            if expires > time.monotonic() and version == self._versions.get(key, 0):
+                self._entries.move_to_end(key)
+                return entry
+            del self._entries[key]
+        return None
+
+    def bump(self, *keys: Hashable):
+        with self._lock:
+            for key in keys:
+                if key in self._entries:
+                    del self._entries[key]
+                    self.invalidations += 1
+                elif key not in self._loading:
+                    continue
+                if key in self._loading:
+                    self._versions[key] = self._versions.get(key, 0) + 1
+                else:
+                    self._versions.pop(key, None)
+
+    def bump_all(self):
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            for key in self._loading:
+                self._versions[key] = self._versions.get(key, 0) + 1
+            for key in list(self._versions):
+                if key not in self._loading:
+                    del self._versions[key]
+
+    def _forget(self, key: Hashable):
+        if key not in self._loading:
+            self._versions.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
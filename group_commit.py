@@ -0,0 +1,99 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, List
+
+_STOP = object()
+
+
+class WriterClosed(RuntimeError):
+    pass
+
+
+class GroupCommitWriter:
+    # Un seul thread écrivain regroupe les opérations soumises par les threads de requête
+    # pendant une courte fenêtre (temps ou taille), les applique via `apply_batch` en une
+    # seule transaction, puis rend à chaque appelant son propre résultat.
+
+    def __init__(self, apply_batch: Callable[[List[Any]], List[Any]], max_batch: int = 256, max_delay: float = 0.002,
+                 timeout: float = 30.0):
+        self.apply_batch = apply_batch
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self.batches = 0
+        self.operations = 0
+        self._closed = False
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='group-commit-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, operation: Any) -> Any:
+        # WriterClosed si l'écrivain est arrêté ; TimeoutError si l'opération n'a pas été prise
+        # en charge dans `timeout` secondes (elle est alors annulée, jamais appliquée)
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise WriterClosed("Écriture groupée arrêtée.")
+            self._queue.put((operation, future))
+        try:
+            return future.result(self.timeout)
+        except FutureTimeoutError:
+            if future.cancel():
+                raise
+            return future.result()  # lot en cours d'application : il se termine
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join()
+        # Opérations arrivées derrière le signal d'arrêt : jamais appliquées
+        while True:
+            try:
+                _, future = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if future.set_running_or_notify_cancel():
+                future.set_exception(WriterClosed("Écriture groupée arrêtée."))
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._flush(batch)
+
+    def _flush(self, batch: List):
+        # Les opérations annulées par un appelant lassé d'attendre sont écartées
+        batch = [(operation, future) for operation, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        operations = [operation for operation, _ in batch]
+        try:
+            results = self.apply_batch(operations)
+        except Exception as exc:
+            for _, future in batch:
+                future.set_exception(exc)
+            return
+        self.batches += 1
+        self.operations += len(batch)
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
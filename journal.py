@@ -0,0 +1,352 @@
+import array
+import datetime
+import mmap
+import os
+import struct
+import sys
+import threading
+import zlib
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from ledger import ArrayLedger, TYPE_NAMES, from_timestamp, to_timestamp, type_code
+
+# Politiques de fsync du journal
+FSYNC_ALWAYS = 'always'  # fsync après chaque opération
+FSYNC_BATCH = 'batch'    # fsync toutes les `batch_size` opérations ou `batch_interval` secondes
+FSYNC_OFF = 'off'        # pas de fsync : chaque écriture atteint le système, qui décide du disque
+FSYNC_POLICIES = (FSYNC_ALWAYS, FSYNC_BATCH, FSYNC_OFF)
+
+JOURNAL_FILE = 'journal.bin'
+SNAPSHOT_FILE = 'snapshot.bin'
+SNAPSHOT_MAGIC = b'BQSNAP1\0'
+
+CREATE, DEPOSIT, WITHDRAW, TRANSFER, INTEREST = 1, 2, 3, 4, 5
+# s : chaîne (u16 + UTF-8), d : flottant 64 bits, i : entier non signé 32 bits
+SCHEMAS = {
+    CREATE: 'sdds',      # nom, solde initial, taux, PIN
+    DEPOSIT: 'sds',      # nom, montant, description
+    WITHDRAW: 'sds',     # nom, montant, description
+    TRANSFER: 'ssdss',   # émetteur, destinataire, montant, description sortante, description entrante
+    INTEREST: 'sdi',     # nom, montant, date des derniers intérêts (ordinal)
+}
+
+FRAME = struct.Struct('<I')
+HEADER = struct.Struct('<QqB')
+DOUBLE = struct.Struct('<d')
+UINT16 = struct.Struct('<H')
+UINT32 = struct.Struct('<I')
+SNAPSHOT_HEADER = struct.Struct('<8sQI')
+ACCOUNT_HEADER = struct.Struct('<ddIQI')
+
+
+def _encode(op: int, fields: Tuple) -> bytes:
+    parts = []
+    for kind, value in zip(SCHEMAS[op], fields):
+        if kind == 's':
+            raw = value.encode('utf-8')
+            parts.append(UINT16.pack(len(raw)))
+            parts.append(raw)
+        elif kind == 'd':
+            parts.append(DOUBLE.pack(value))
+        else:
+            parts.append(UINT32.pack(value))
+    return b''.join(parts)
+
+
+def _decode(op: int, payload: bytes, offset: int) -> List:
+    fields = []
+    for kind in SCHEMAS[op]:
+        if kind == 's':
+            (length,) = UINT16.unpack_from(payload, offset)
+            offset += UINT16.size
+            fields.append(payload[offset:offset + length].decode('utf-8'))
+            offset += length
+        elif kind == 'd':
+            fields.append(DOUBLE.unpack_from(payload, offset)[0])
+            offset += DOUBLE.size
+        else:
+            fields.append(UINT32.unpack_from(payload, offset)[0])
+            offset += UINT32.size
+    return fields
+
+
+class Journal:
+    # Journal binaire en ajout seul. Chaque enregistrement est encadré par sa longueur et
+    # un CRC32 : une fin de fichier tronquée par un arrêt brutal est détectée et ignorée.
+
+    def __init__(self, path: str, fsync: str = FSYNC_BATCH, next_seq: int = 1,
+                 batch_size: int = 256, batch_interval: float = 0.05):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Politique de fsync inconnue : {fsync}")
+        self.path = path
+        self.fsync = fsync
+        self.next_seq = next_seq
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.records = 0
+        self._pending = 0
+        self._lock = threading.RLock()
+        # Sans tampon : chaque enregistrement est remis au système dès son écriture et survit
+        # à un arrêt brutal du processus ; seul le fsync dépend de la politique
+        self._file = open(path, 'ab', buffering=0)
+        self._closed = threading.Event()
+        self._flusher = None
+        if fsync == FSYNC_BATCH:
+            # Borne le délai avant fsync même quand plus aucune opération n'arrive
+            self._flusher = threading.Thread(target=self._flush_periodically, name='journal-fsync', daemon=True)
+            self._flusher.start()
+
+    def _flush_periodically(self):
+        while not self._closed.wait(self.batch_interval):
+            with self._lock:
+                if self._pending and not self._file.closed:
+                    self.sync()
+
+    def record(self, op: int, date: datetime.datetime, *fields):
+        body = _encode(op, fields)
+        with self._lock:
+            payload = HEADER.pack(self.next_seq, to_timestamp(date), op) + body
+            self._file.write(FRAME.pack(len(payload)) + payload + UINT32.pack(zlib.crc32(payload)))
+            self.next_seq += 1
+            self.records += 1
+            if self.fsync == FSYNC_ALWAYS:
+                os.fsync(self._file.fileno())
+            elif self.fsync == FSYNC_BATCH:
+                self._pending += 1
+                if self._pending >= self.batch_size:
+                    self.sync()
+
+    def sync(self):
+        with self._lock:
+            os.fsync(self._file.fileno())
+            self._pending = 0
+
+    def truncate(self):
+        # Après un instantané : les enregistrements qu'il contient ne sont plus utiles
+        with self._lock:
+            self._file.truncate(0)
+            self.records = 0
+            self.sync()
+
+    def close(self):
+        self._closed.set()
+        if self._flusher:
+            self._flusher.join()
+        with self._lock:
+            if self.fsync != FSYNC_OFF:
+                self.sync()
+            self._file.close()
+
+
+def read_journal(path: str, after_seq: int = 0) -> Iterator[Tuple[int, datetime.datetime, int, List]]:
+    # Rejoue les enregistrements valides de seq > after_seq ; s'arrête au premier
+    # enregistrement incomplet ou corrompu, qui est retiré du fichier.
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return
+    with open(path, 'r+b') as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        offset, size = 0, len(data)
+        while offset + FRAME.size <= size:
+            (length,) = FRAME.unpack_from(data, offset)
+            end = offset + FRAME.size + length + UINT32.size
+            if end > size:
+                break
+            payload = data[offset + FRAME.size:end - UINT32.size]
+            if zlib.crc32(payload) != UINT32.unpack_from(data, end - UINT32.size)[0]:
+                break
+            seq, timestamp, op = HEADER.unpack_from(payload)
+            if seq > after_seq:
+                yield seq, from_timestamp(timestamp), op, _decode(op, payload, HEADER.size)
+            offset = end
+    if offset < size:
+        with open(path, 'r+b') as handle:
+            handle.truncate(offset)
+
+
+def _pack_string(value: str) -> bytes:
+    raw = value.encode('utf-8')
+    return UINT16.pack(len(raw)) + raw
+
+
+def _read_string(data, offset: int) -> Tuple[str, int]:
+    (length,) = UINT16.unpack_from(data, offset)
+    offset += UINT16.size
+    return bytes(data[offset:offset + length]).decode('utf-8'), offset + length
+
+
+def _as_array_ledger(transactions) -> ArrayLedger:
+    if isinstance(transactions, ArrayLedger):
+        return transactions
+    ledger = ArrayLedger()
+    for transaction in transactions:
+        ledger.record(transaction.amount, transaction.type, transaction.description, transaction.date)
+    return ledger
+
+
+def write_snapshot(path: str, accounts, last_seq: int):
+    # Instantané compacté : écrit dans un fichier temporaire puis renommé de façon atomique
+    accounts = list(accounts)
+    temporary = path + '.tmp'
+    with open(temporary, 'wb') as handle:
+        handle.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, last_seq, len(accounts)))
+        handle.write(UINT16.pack(len(TYPE_NAMES)))
+        for name in TYPE_NAMES:
+            handle.write(_pack_string(name))
+        for account in accounts:
+            ledger = _as_array_ledger(account.transactions)
+            handle.write(_pack_string(account.name))
+            handle.write(_pack_string(account.pin))
+            handle.write(ACCOUNT_HEADER.pack(
+                account.balance, account.interest_rate, account.last_interest_date.toordinal(),
+                len(ledger), len(ledger.descriptions),
+            ))
+            for column in (ledger.amounts, ledger.timestamps, ledger.types):
+                if sys.byteorder != 'little':
+                    column = array.array(column.typecode, column)
+                    column.byteswap()
+                handle.write(column.tobytes())
+            for index, description in ledger.descriptions.items():
+                handle.write(struct.pack('<Q', index) + _pack_string(description))
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(temporary, path)
+    # Le renommage doit être durable avant que le journal ne soit vidé
+    fsync_directory(os.path.dirname(os.path.abspath(path)))
+
+
+def fsync_directory(directory: str):
+    if os.name == 'nt':
+        return  # pas de fsync de répertoire sous Windows ; NTFS journalise ses métadonnées
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def load_snapshot(path: str, new_account) -> Tuple[int, List]:
+    # Le fichier est projeté en mémoire : les colonnes sont copiées en bloc dans les tableaux,
+    # sans décodage ligne à ligne. `new_account(nom, solde, taux, pin)` crée chaque compte.
+    if not os.path.exists(path):
+        return 0, []
+    accounts = []
+    with open(path, 'rb') as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        view = memoryview(data)
+        try:
+            magic, last_seq, count = SNAPSHOT_HEADER.unpack_from(data, 0)
+            if magic != SNAPSHOT_MAGIC:
+                raise ValueError(f"Instantané invalide : {path}")
+            offset = SNAPSHOT_HEADER.size
+            (type_count,) = UINT16.unpack_from(data, offset)
+            offset += UINT16.size
+            # Les codes de type de l'instantané sont retraduits vers ceux du processus courant
+            translation = bytearray(range(256))
+            for code in range(type_count):
+                name, offset = _read_string(data, offset)
+                translation[code] = type_code(name)
+            translation = bytes(translation)
+            identity = translation == bytes(range(256))
+
+            for _ in range(count):
+                name, offset = _read_string(data, offset)
+                pin, offset = _read_string(data, offset)
+                balance, interest_rate, last_interest, length, descriptions = ACCOUNT_HEADER.unpack_from(data, offset)
+                offset += ACCOUNT_HEADER.size
+                ledger = ArrayLedger()
+                for column, width in ((ledger.amounts, 8), (ledger.timestamps, 8)):
+                    with view[offset:offset + width * length] as chunk:
+                        column.frombytes(chunk)
+                    if sys.byteorder != 'little':
+                        column.byteswap()
+                    offset += width * length
+                with view[offset:offset + length] as chunk:
+                    ledger.types.frombytes(chunk if identity else bytes(chunk).translate(translation))
+                offset += length
+                for _ in range(descriptions):
+                    (index,) = struct.unpack_from('<Q', data, offset)
+                    description, offset = _read_string(data, offset + 8)
+                    ledger.descriptions[index] = description
+
+                account = new_account(name, balance, interest_rate, pin)
+                account.last_interest_date = datetime.date.fromordinal(last_interest)
+                if isinstance(account.transactions, ArrayLedger):
+                    account.transactions = ledger
+                else:
+                    for entry in ledger:
+                        account.transactions.record(entry.amount, entry.type, entry.description, entry.date)
+                accounts.append(account)
+        finally:
+            view.release()
+    return last_seq, accounts
+
+
+class BankStore:
+    # Persistance d'un Bank en mémoire : instantané + queue de journal au démarrage,
+    # journalisation de chaque opération ensuite, instantané compacté tous les
+    # `snapshot_every` enregistrements et à la fermeture. Le Bank prend l'instantané
+    # (`snapshot_due`) une fois ses verrous relâchés.
+
+    def __init__(self, directory: str, fsync: str = FSYNC_BATCH, snapshot_every: int = 100_000):
+        self.directory = directory
+        self.fsync = fsync
+        self.snapshot_every = snapshot_every
+        self.journal: Optional[Journal] = None
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def journal_path(self) -> str:
+        return os.path.join(self.directory, JOURNAL_FILE)
+
+    @property
+    def snapshot_path(self) -> str:
+        return os.path.join(self.directory, SNAPSHOT_FILE)
+
+    def load(self, bank):
+        def new_account(name, balance, interest_rate, pin):
+            return bank.new_account(name, balance, interest_rate, pin)
+
+        last_seq, accounts = load_snapshot(self.snapshot_path, new_account)
+        for account in accounts:
+            bank.accounts[account.name] = account
+        replayed = 0
+        for seq, date, op, fields in read_journal(self.journal_path, last_seq):
+            replay(bank, op, date, fields)
+            last_seq = seq
+            replayed += 1
+        self.journal = Journal(self.journal_path, self.fsync, next_seq=last_seq + 1)
+        self.journal.records = replayed
+
+    def record(self, op: int, date: datetime.datetime, *fields):
+        self.journal.record(op, date, *fields)
+
+    @property
+    def snapshot_due(self) -> bool:
+        return self.journal.records >= self.snapshot_every
+
+    def snapshot(self, bank):
+        write_snapshot(self.snapshot_path, bank.accounts.values(), self.journal.next_seq - 1)
+        self.journal.truncate()
+
+    def close(self, bank):
+        if self.journal.records:
+            self.snapshot(bank)
+        self.journal.close()
+
+
+def replay(bank, op: int, date: datetime.datetime, fields: List):
+    accounts: Dict = bank.accounts
+    if op == CREATE:
+        name, balance, interest_rate, pin = fields
+        accounts[name] = bank.new_account(name, balance, interest_rate, pin)
+    elif op == DEPOSIT:
+        name, amount, description = fields
+        accounts[name]._deposit(amount, description, date)
+    elif op == WITHDRAW:
+        name, amount, description = fields
+        accounts[name]._withdraw(amount, description, date)
+    elif op == TRANSFER:
+        from_name, to_name, amount, outgoing, incoming = fields
+        accounts[from_name]._withdraw(amount, outgoing, date)
+        accounts[to_name]._deposit(amount, incoming, date)
+    elif op == INTEREST:
+        name, amount, last_interest = fields
+        accounts[name]._credit_interest(amount, datetime.date.fromordinal(last_interest), date)
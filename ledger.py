@@ -0,0 +1,114 @@
+import array
+import datetime
+import time
+from typing import Dict, Iterator, List
+
+# Codes des types de transaction (uint8) ; un type inconnu reçoit le code suivant
+TYPE_NAMES: List[str] = ["Dépôt", "Retrait", "Intérêts", "Transfert"]
+TYPE_CODES: Dict[str, int] = {name: code for code, name in enumerate(TYPE_NAMES)}
+
+
+def type_code(transaction_type: str) -> int:
+    code = TYPE_CODES.get(transaction_type)
+    if code is None:
+        if len(TYPE_NAMES) > 255:
+            raise ValueError(f"Trop de types de transaction différents : {transaction_type}")
+        code = TYPE_CODES[transaction_type] = len(TYPE_NAMES)
+        TYPE_NAMES.append(transaction_type)
+    return code
+
+
+def to_timestamp(date: datetime.datetime) -> int:
+    # Microsecondes depuis l'epoch ; une date naïve est interprétée en heure locale
+    return int(date.timestamp()) * 1_000_000 + date.microsecond
+
+
+def from_timestamp(timestamp: int) -> datetime.datetime:
+    seconds, microseconds = divmod(timestamp, 1_000_000)
+    return datetime.datetime.fromtimestamp(seconds).replace(microsecond=microseconds)
+
+
+def format_transaction(date: datetime.datetime, transaction_type: str, amount: float, description: str) -> str:
+    if description:
+        return f"{date.strftime('%Y-%m-%d %H:%M:%S')} - {transaction_type}: {amount:.2f}€ - {description}"
+    return f"{date.strftime('%Y-%m-%d %H:%M:%S')} - {transaction_type}: {amount:.2f}€"
+
+
+class ObjectLedger(list):
+    # Historique classique : une liste d'objets Transaction
+    __slots__ = ('transaction_class',)
+
+    def __init__(self, transaction_class):
+        super().__init__()
+        self.transaction_class = transaction_class
+
+    def record(self, amount: float, transaction_type: str, description: str = "", date: datetime.datetime = None):
+        transaction = self.transaction_class(amount, transaction_type, description)
+        if date is not None:
+            transaction.date = date
+        self.append(transaction)
+
+
+class LedgerEntry:
+    # Vue légère sur une ligne d'un ArrayLedger : les champs sont lus à la demande
+    __slots__ = ('_ledger', '_index')
+
+    def __init__(self, ledger: 'ArrayLedger', index: int):
+        self._ledger = ledger
+        self._index = index
+
+    @property
+    def amount(self) -> float:
+        return self._ledger.amounts[self._index] / 100
+
+    @property
+    def type(self) -> str:
+        return TYPE_NAMES[self._ledger.types[self._index]]
+
+    @property
+    def date(self) -> datetime.datetime:
+        return from_timestamp(self._ledger.timestamps[self._index])
+
+    @property
+    def description(self) -> str:
+        return self._ledger.descriptions.get(self._index, "")
+
+    def __str__(self):
+        return format_transaction(self.date, self.type, self.amount, self.description)
+
+
+class ArrayLedger:
+    # Historique compact en tableaux parallèles : montants en centimes (int64), dates en
+    # microsecondes depuis l'epoch (int64) et codes de type (uint8). Les descriptions, rares,
+    # sont gardées à part par indice.
+    __slots__ = ('amounts', 'timestamps', 'types', 'descriptions')
+
+    def __init__(self):
+        self.amounts = array.array('q')
+        self.timestamps = array.array('q')
+        self.types = array.array('B')
+        self.descriptions: Dict[int, str] = {}
+
+    def record(self, amount: float, transaction_type: str, description: str = "", date: datetime.datetime = None):
+        code = TYPE_CODES.get(transaction_type)
+        if code is None:
+            code = type_code(transaction_type)
+        if description:
+            self.descriptions[len(self.amounts)] = description
+        self.amounts.append(round(amount * 100))
+        self.timestamps.append(time.time_ns() // 1000 if date is None else to_timestamp(date))
+        self.types.append(code)
+
+    def __len__(self) -> int:
+        return len(self.amounts)
+
+    def __getitem__(self, index: int) -> LedgerEntry:
+        if index < 0:
+            index += len(self.amounts)
+        if not 0 <= index < len(self.amounts):
+            raise IndexError(index)
+        return LedgerEntry(self, index)
+
+    def __iter__(self) -> Iterator[LedgerEntry]:
+        for index in range(len(self.amounts)):
+            yield LedgerEntry(self, index)
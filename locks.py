@@ -0,0 +1,50 @@
+import contextlib
+import threading
+from typing import List
+
+DEFAULT_STRIPES = 64
+
+_UNLOCKED = contextlib.nullcontext()
+
+
+class StripedLocks:
+    # Verrous répartis par hachage du nom de compte. Les opérations qui touchent plusieurs
+    # comptes prennent leurs bandes dans l'ordre croissant : pas d'interblocage possible.
+    # `registry` protège la table des comptes (créations, instantanés).
+
+    def __init__(self, stripes: int = DEFAULT_STRIPES):
+        self._locks: List[threading.Lock] = [threading.Lock() for _ in range(stripes)]
+        self.registry = threading.Lock()
+
+    def stripe(self, name: str) -> int:
+        return hash(name) % len(self._locks)
+
+    def hold(self, *names: str):
+        if len(names) == 1:
+            return self._locks[self.stripe(names[0])]
+        return self._hold(sorted({self.stripe(name) for name in names}))
+
+    def hold_all(self):
+        return self._hold(range(len(self._locks)), self.registry)
+
+    @contextlib.contextmanager
+    def _hold(self, indexes, *first: threading.Lock):
+        acquired = list(first) + [self._locks[index] for index in indexes]
+        for lock in acquired:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(acquired):
+                lock.release()
+
+
+class NoLocks:
+    # Même interface sans verrouillage, pour un Bank utilisé depuis un seul thread
+    registry = _UNLOCKED
+
+    def hold(self, *names: str):
+        return _UNLOCKED
+
+    def hold_all(self):
+        return _UNLOCKED
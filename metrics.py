@@ -0,0 +1,166 @@
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from flask import Flask, Response, request
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+SLOW_LOG_MAX_STATEMENTS = 50
+
+
+class RouteStats:
+    __slots__ = ('buckets', 'count', 'latency_sum', 'queries', 'db_time', 'commits')
+
+    def __init__(self):
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.latency_sum = 0.0
+        self.queries = 0
+        self.db_time = 0.0
+        self.commits = 0
+
+
+class RequestStats:
+    __slots__ = ('route', 'method', 'started', 'queries', 'db_time', 'commits', 'statements', 'status', 'streamed')
+
+    def __init__(self, route: str, method: str, record_statements: bool):
+        self.route = route
+        self.method = method
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.commits = 0
+        self.statements: Optional[List] = [] if record_statements else None
+        self.status = None
+        self.streamed = False
+
+
+class Metrics:
+    # Mesures par route : histogramme des latences, nombre de requêtes SQL, temps passé
+    # en base et nombre de commits. Les événements du moteur SQLAlchemy sont rattachés à
+    # la requête en cours du thread ; hors requête (CLI, thread d'écriture groupée) ils
+    # sont ignorés.
+
+    def __init__(self, app: Optional[Flask] = None, slow_request_threshold: Optional[float] = None):
+        self.slow_request_threshold = slow_request_threshold
+        self.routes: Dict[str, RouteStats] = {}
+        self.counters: List[Tuple[str, str, Callable[[], float]]] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._app = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask):
+        self._app = app
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        app.add_url_rule('/metrics', 'metrics', self.render)
+
+    def register_counter(self, name: str, help_text: str, read: Callable[[], float]):
+        # Compteur global lu au moment du rendu (cache, files d'attente...)
+        self.counters.append((name, help_text, read))
+
+    def instrument_engine(self, engine):
+        event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+        event.listen(engine, 'commit', self._commit)
+
+    def _before_request(self):
+        route = request.url_rule.rule if request.url_rule else '<inconnue>'
+        self._local.stats = RequestStats(route, request.method, self.slow_request_threshold is not None)
+
+    def _after_request(self, response):
+        stats = self._current()
+        if stats:
+            stats.status = response.status_code
+            if response.is_streamed:
+                # Réponse en flux : la mesure se termine quand le serveur ferme la réponse
+                stats.streamed = True
+                response.call_on_close(lambda: self._finish(stats))
+        return response
+
+    def _teardown_request(self, exc):
+        stats = self._current()
+        if stats and not stats.streamed:
+            self._finish(stats)
+
+    def _finish(self, stats: RequestStats):
+        if self._current() is stats:
+            self._local.stats = None
+        elapsed = time.perf_counter() - stats.started
+        with self._lock:
+            route_stats = self.routes.get(stats.route)
+            if route_stats is None:
+                route_stats = self.routes[stats.route] = RouteStats()
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if elapsed <= bound:
+                    route_stats.buckets[i] += 1
+            route_stats.count += 1
+            route_stats.latency_sum += elapsed
+            route_stats.queries += stats.queries
+            route_stats.db_time += stats.db_time
+            route_stats.commits += stats.commits
+        if self.slow_request_threshold is not None and elapsed >= self.slow_request_threshold:
+            self._log_slow_request(elapsed, stats)
+
+    def _log_slow_request(self, elapsed: float, stats: RequestStats):
+        statements = '\n'.join(f"  {duration * 1000:8.2f} ms  {statement}" for statement, duration in stats.statements)
+        self._app.logger.warning(
+            "Requête lente %s %s (%s) : %.1f ms, %d requête(s) SQL en %.1f ms, %d commit(s)\n%s",
+            stats.method, stats.route, stats.status, elapsed * 1000, stats.queries, stats.db_time * 1000,
+            stats.commits, statements,
+        )
+
+    def _current(self) -> Optional[RequestStats]:
+        return getattr(self._local, 'stats', None)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        context._metrics_started = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        stats = self._current()
+        if stats is None:
+            return
+        duration = time.perf_counter() - context._metrics_started
+        stats.queries += 1
+        stats.db_time += duration
+        if stats.statements is not None and len(stats.statements) < SLOW_LOG_MAX_STATEMENTS:
+            stats.statements.append((' '.join(statement.split()), duration))
+
+    def _commit(self, conn):
+        stats = self._current()
+        if stats is not None:
+            stats.commits += 1
+
+    def render(self) -> Response:
+        lines = [
+            '# HELP banque_request_duration_seconds Durée des requêtes HTTP par route.',
+            '# TYPE banque_request_duration_seconds histogram',
+        ]
+        with self._lock:
+            routes = sorted(self.routes.items())
+            for route, stats in routes:
+                for bound, count in zip(LATENCY_BUCKETS, stats.buckets):
+                    lines.append(f'banque_request_duration_seconds_bucket{{route="{route}",le="{bound}"}} {count}')
+                lines.append(f'banque_request_duration_seconds_bucket{{route="{route}",le="+Inf"}} {stats.count}')
+                lines.append(f'banque_request_duration_seconds_sum{{route="{route}"}} {stats.latency_sum:.6f}')
+                lines.append(f'banque_request_duration_seconds_count{{route="{route}"}} {stats.count}')
+            for name, help_text, attribute in (
+                ('banque_db_queries_total', 'Requêtes SQL exécutées, par route.', 'queries'),
+                ('banque_db_time_seconds_total', 'Temps passé dans la base de données, par route.', 'db_time'),
+                ('banque_db_commits_total', 'Commits de transaction, par route.', 'commits'),
+            ):
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} counter')
+                for route, stats in routes:
+                    value = getattr(stats, attribute)
+                    lines.append(f'{name}{{route="{route}"}} {value:.6f}' if isinstance(value, float)
+                                 else f'{name}{{route="{route}"}} {value}')
+        for name, help_text, read in self.counters:
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} counter')
+            lines.append(f'{name} {read()}')
+        return Response('\n'.join(lines) + '\n', mimetype='text/plain; version=0.0.4')
@@ -0,0 +1,77 @@
+from typing import Dict, List, NamedTuple, Sequence, Union
+
+import numpy as np
+
+# Projection des intérêts mensuels composés, vectorisée sur tous les comptes à la fois.
+# Même règle que Account.apply_monthly_interest : chaque mois, solde += solde * taux / 12.
+# Un scénario décale le taux annuel de chaque compte, mois par mois.
+
+MAX_MONTHS = 600
+
+ScenarioShifts = Union[float, Sequence[float]]
+
+
+class Projection(NamedTuple):
+    scenarios: List[str]
+    months: int
+    initial: np.ndarray          # (comptes,)
+    final: np.ndarray            # (scénarios, comptes)
+    monthly_totals: np.ndarray   # (scénarios, mois + 1) : encours total, mois 0 compris
+    monthly_interest: np.ndarray  # (scénarios, mois) : intérêts versés sur l'ensemble des comptes
+
+    @property
+    def interest(self) -> np.ndarray:
+        # Intérêts cumulés par scénario et par compte
+        return self.final - self.initial
+
+    def summary(self) -> List[Dict]:
+        return [
+            {
+                'scenario': name,
+                'total_interest': float(self.monthly_interest[index].sum()),
+                'final_total_balance': float(self.monthly_totals[index, -1]),
+                'monthly': [
+                    {'month': month + 1, 'interest': float(interest), 'total_balance': float(total)}
+                    for month, (interest, total) in enumerate(
+                        zip(self.monthly_interest[index], self.monthly_totals[index, 1:])
+                    )
+                ],
+            }
+            for index, name in enumerate(self.scenarios)
+        ]
+
+
+def scenario_shifts(shifts: ScenarioShifts, months: int) -> np.ndarray:
+    # Un décalage constant, ou un décalage par mois (complété avec la dernière valeur)
+    try:
+        values = np.atleast_1d(np.asarray(shifts, dtype=np.float64))
+    except (TypeError, ValueError):
+        values = None
+    if values is None or values.ndim != 1 or not len(values) or not np.isfinite(values).all():
+        raise ValueError("Scénario invalide : un nombre ou une liste de nombres est attendu.")
+    if len(values) >= months:
+        return values[:months]
+    return np.concatenate([values, np.full(months - len(values), values[-1])])
+
+
+def project(balances: np.ndarray, rates: np.ndarray, months: int,
+            scenarios: Dict[str, ScenarioShifts] = None) -> Projection:
+    if not 0 < months <= MAX_MONTHS:
+        raise ValueError(f"L'horizon doit être compris entre 1 et {MAX_MONTHS} mois.")
+    scenarios = scenarios or {'base': 0.0}
+    names = list(scenarios)
+    shifts = np.stack([scenario_shifts(scenarios[name], months) for name in names])  # (scénarios, mois)
+
+    initial = np.asarray(balances, dtype=np.float64)
+    monthly_rates = np.asarray(rates, dtype=np.float64) / 12
+    current = np.tile(initial, (len(names), 1))
+    factor = np.empty_like(current)
+    totals = np.empty((len(names), months + 1))
+    totals[:, 0] = initial.sum()
+    # Une passe par mois, vectorisée sur (scénarios, comptes) : la mémoire reste en O(scénarios x comptes)
+    for month in range(months):
+        np.add(monthly_rates, (shifts[:, month] / 12)[:, None], out=factor)
+        factor += 1
+        current *= factor
+        totals[:, month + 1] = current.sum(axis=1)
+    return Projection(names, months, initial, current, totals, np.diff(totals, axis=1))
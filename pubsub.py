@@ -0,0 +1,94 @@
+import collections
+import threading
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+
+class Subscription:
+    # File d'événements d'un abonné, bornée : quand elle déborde, les événements en attente sont
+    # abandonnés et l'abonné est marqué `stale`, à charge pour lui de relire l'état à la source.
+    __slots__ = ('key', 'events', 'stale', 'max_events', '_condition')
+
+    def __init__(self, key: Hashable, max_events: int):
+        self.key = key
+        self.events: 'collections.deque' = collections.deque()
+        self.stale = False
+        self.max_events = max_events
+        self._condition = threading.Condition()
+
+    def push(self, event) -> bool:
+        with self._condition:
+            overflow = len(self.events) >= self.max_events
+            if overflow:
+                self.events.clear()
+                self.stale = True
+            else:
+                self.events.append(event)
+            self._condition.notify()
+            return not overflow
+
+    def mark_stale(self):
+        with self._condition:
+            self.events.clear()
+            self.stale = True
+            self._condition.notify()
+
+    def get(self, timeout: float) -> Optional[Tuple[List, bool]]:
+        # (événements, stale), ou None si rien n'est arrivé avant `timeout`
+        with self._condition:
+            if not self.events and not self.stale:
+                self._condition.wait(timeout)
+            if not self.events and not self.stale:
+                return None
+            events, stale = list(self.events), self.stale
+            self.events.clear()
+            self.stale = False
+            return events, stale
+
+
+class EventHub:
+    # Publication/abonnement en mémoire, par clé (un id de compte). Les événements ne quittent
+    # pas le processus : avec plusieurs processus, chacun ne voit que ses propres écritures.
+
+    def __init__(self, max_events: int = 100):
+        self.max_events = max_events
+        self._subscribers: Dict[Hashable, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+        self.published = 0
+        self.overflows = 0
+
+    def subscribe(self, key: Hashable) -> Subscription:
+        subscription = Subscription(key, self.max_events)
+        with self._lock:
+            self._subscribers.setdefault(key, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.key)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.key]
+
+    def has_subscribers(self, key: Hashable) -> bool:
+        return key in self._subscribers
+
+    def publish(self, key: Hashable, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(key, ()))
+            self.published += len(subscribers)
+        overflows = sum(not subscription.push(event) for subscription in subscribers)
+        if overflows:
+            with self._lock:
+                self.overflows += overflows
+
+    def mark_all_stale(self):
+        # Écriture ensembliste (intérêts en masse) : chaque abonné relit son état
+        with self._lock:
+            subscribers = [subscription for group in self._subscribers.values() for subscription in group]
+        for subscription in subscribers:
+            subscription.mark_stale()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(group) for group in self._subscribers.values())